@@ -3,17 +3,24 @@
 # reports.wwdt.me is released under the terms of the Apache License 2.0
 """Flask application startup file"""
 
+from datetime import date, datetime
+from hashlib import sha1
 import json
-from typing import Optional, Text
+import mimetypes
+import os
+from typing import Dict, Optional, Text, Tuple
 import traceback
 
-from flask import Flask, redirect, render_template, request, Response, url_for
+from functools import wraps
+
+from flask import (abort, Flask, g, make_response, redirect, render_template,
+                   request, Response, url_for)
 from flask.logging import create_logger
-import mysql.connector
 import pytz
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import is_resource_modified
 
-from reports import utility
+from reports import compression, data_version, database, page_cache, utility
 from reports.guest import (best_of_only,
                            most_appearances,
                            scores as guest_scores)
@@ -45,6 +52,10 @@ from reports.show import (all_women_panel,
 
 #region Global Constants
 APP_VERSION = "1.18.1"
+DEFAULT_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+SORT_QUERY_ARGS = {"sort": ("asc", "desc")}
+PANEL_GENDERS = ("female", "male")
+PANEL_GENDER_ALIASES = {"f": "female", "m": "male"}
 RANK_MAP = {
     "1": "First",
     "1t": "First Tied",
@@ -88,6 +99,166 @@ def load_config():
 
 #endregion
 
+#region Database Connection Functions
+def get_database_connection():
+    """Check out a database connection from the connection pool for
+    the current request"""
+    if "database_connection" not in g:
+        g.database_connection = database_pool.acquire()
+
+    return g.database_connection
+
+@app.teardown_appcontext
+def release_database_connection(exception=None):
+    """Return the database connection for the current request back to
+    the connection pool"""
+    connection = g.pop("database_connection", None)
+    if connection is not None:
+        database_pool.release(connection)
+
+#endregion
+
+#region Page Cache Functions
+def page_etag(version: str, key, encoding: str, rendered_on: date) -> str:
+    """Build an ETag for a report page from the data version, the
+    application and template versions, the page cache key, the content
+    encoding and the render date, so pages that depend on the date are
+    revalidated daily"""
+    checksum = sha1("|".join([str(version),
+                              APP_VERSION,
+                              template_version,
+                              repr(key),
+                              rendered_on.isoformat()]).encode("utf-8"))
+    if encoding == compression.IDENTITY:
+        return checksum.hexdigest()
+
+    return "{}-{}".format(checksum.hexdigest(), encoding)
+
+def page_last_modified(rendered_on: date) -> datetime:
+    """Return the time the data last changed, or the start of the render
+    date if that is later, so pages that depend on the date are
+    revalidated daily by clients that only send If-Modified-Since"""
+    start_of_day = datetime.combine(rendered_on, datetime.min.time()).astimezone(pytz.utc)
+    last_modified = data_version.probe.last_modified()
+    if not last_modified:
+        return start_of_day
+
+    return max(last_modified, start_of_day)
+
+def set_validators(response: Response, etag: str, last_modified: datetime,
+                   cache_control: str) -> Response:
+    """Set the ETag, Last-Modified, Cache-Control and Vary headers for
+    a report page response. The ETag is weak as the page footer includes
+    the time the page was rendered"""
+    response.set_etag(etag, weak=True)
+    response.vary.add("Accept-Encoding")
+    response.last_modified = last_modified
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+
+    return response
+
+def cached_page(view=None, cache_control: str = None,
+                query_args: Optional[Dict[Text, Tuple[Text, ...]]] = None):
+    """Decorator that answers conditional GET requests for a report
+    route, serves pages from the rendered page cache and stores newly
+    rendered pages in the cache. Conditional requests are answered
+    before the page cache is checked or the report function runs.
+    Cached pages are discarded and ETags change once the data version,
+    the application or templates, or the date change. Pages are compressed once
+    when rendered and served in the encoding preferred by the request's
+    Accept-Encoding header.
+
+    The Cache-Control header can be set for a route by passing
+    cache_control; otherwise the value configured for the route's
+    endpoint, or the default configured value, is used. Query arguments
+    read by the view, and the values it recognizes for each, are passed
+    as query_args so that only those are part of the page cache key"""
+    if view is None:
+        return lambda view: cached_page(view, cache_control=cache_control,
+                                        query_args=query_args)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != "GET":
+            return view(*args, **kwargs)
+
+        version = data_version.probe.current(get_database_connection())
+
+        key = rendered_pages.make_key(request.path, request.args, query_args)
+        encoding = compression.select_encoding(request.accept_encodings)
+        rendered_on = date.today()
+        etag = page_etag(version, key, encoding, rendered_on)
+        last_modified = page_last_modified(rendered_on)
+        route_cache_control = (cache_control
+                               or route_cache_controls.get(request.endpoint)
+                               or default_cache_control)
+
+        if not is_resource_modified(request.environ,
+                                    etag=etag,
+                                    last_modified=last_modified):
+            return set_validators(Response(status=304), etag, last_modified,
+                                  route_cache_control)
+
+        entry = None
+        if rendered_pages.enabled:
+            entry = rendered_pages.get(key, version)
+
+        if not entry:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if rendered_pages.enabled:
+                entry = rendered_pages.set(key, version, response.get_data(),
+                                           response.mimetype)
+            else:
+                # Only the selected encoding is needed for a page that is
+                # not kept in the cache
+                entry = page_cache.PageCacheEntry(response.get_data(),
+                                                  response.mimetype, version,
+                                                  encodings=(encoding, ))
+
+        response = Response(entry.encoded_body(encoding), mimetype=entry.mimetype)
+        if encoding != compression.IDENTITY:
+            response.headers["Content-Encoding"] = encoding
+
+        return set_validators(response, etag, last_modified, route_cache_control)
+
+    return wrapper
+
+#endregion
+
+#region Static File Functions
+def send_static_file(filename: str):
+    """Serve precompressed static files in the encoding preferred by
+    the request's Accept-Encoding header, falling back to the default
+    static file handler for all other files"""
+    static_file = static_files.get(filename)
+    if not static_file:
+        return app.send_static_file(filename)
+
+    encoding = compression.select_encoding(request.accept_encodings)
+    response = Response(static_file.variants.get(encoding,
+                                                 static_file.variants[compression.IDENTITY]),
+                        mimetype=mimetypes.guess_type(filename)[0])
+    if encoding != compression.IDENTITY:
+        response.headers["Content-Encoding"] = encoding
+        response.set_etag("{}-{}".format(static_file.checksum, encoding))
+    else:
+        response.set_etag(static_file.checksum)
+
+    response.vary.add("Accept-Encoding")
+    response.last_modified = static_file.modified
+    max_age = app.get_send_file_max_age(filename)
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+
+    return response.make_conditional(request)
+
+#endregion
+
 #region Error Handlers
 @app.errorhandler(Exception)
 def handle_exception(error):
@@ -139,34 +310,38 @@ def get_guests():
     return redirect(url_for("get_guest"), 301)
 
 @app.route("/guest/best_of_only")
+@cached_page
 def guest_best_of_only():
     """Best Of Only Guests Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     guests = best_of_only.retrieve_best_of_only_guests(database_connection)
 
     return render_template("guest/best_of_only.html", guests=guests)
 
 @app.route("/guest/most_appearances")
+@cached_page
 def guest_most_appearances():
     """Guests Most Appearances Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     guests = most_appearances.guest_multiple_appearances(database_connection)
 
     return render_template("guest/most_appearances.html", guests=guests)
 
 @app.route("/guest/scoring_exceptions")
+@cached_page
 def guest_scoring_exceptions():
     """Guest Scoring Exceptions Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     exceptions = guest_scores.retrieve_all_scoring_exceptions(database_connection)
 
     return render_template("guest/scoring_exceptions.html",
                            exceptions=exceptions)
 
 @app.route("/guest/three_pointers")
+@cached_page
 def guest_three_pointers():
     """Guest Scoring Three Points Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     three_pointers = guest_scores.retrieve_all_three_pointers(database_connection)
 
     return render_template("guest/three_pointers.html",
@@ -186,9 +361,10 @@ def get_hosts():
     return redirect(url_for("get_host"), 301)
 
 @app.route("/host/appearance_summary")
+@cached_page
 def host_appearance_summary():
     """Host Appearances Summary Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     summary = h_appearances.retrieve_appearance_summaries(database_connection)
 
     return render_template("host/appearance_summary.html", summary=summary)
@@ -207,14 +383,38 @@ def get_locations():
     return redirect(url_for("get_location"), 301)
 
 @app.route("/location/average_scores")
+@cached_page
 def location_average_scores():
     """Location Average Score Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     locations = average_scores.retrieve_average_scores_by_location(database_connection)
 
     return render_template("location/average_scores.html",
                            locations=locations)
 
+@app.route("/location/average_scores/<int:location_id>")
+@cached_page
+def location_average_scores_by_year(location_id: int):
+    """Location Average Score by Year Report"""
+    database_connection = get_database_connection()
+    location = average_scores.retrieve_location_scores_by_year(location_id,
+                                                               database_connection)
+    if not location:
+        abort(404)
+
+    return render_template("location/average_scores_by_year.html",
+                           location=location)
+
+@app.route("/location/average_scores_by_state")
+@cached_page
+def location_average_scores_by_state():
+    """Location Average Score by State Report"""
+    database_connection = get_database_connection()
+    states = average_scores.retrieve_average_scores_by_state(database_connection)
+
+    return render_template("location/average_scores_by_state.html",
+                           states=states)
+
 #endregion
 
 #region Panelist Reports
@@ -229,9 +429,10 @@ def get_panelists():
     return redirect(url_for("get_panelist"), 301)
 
 @app.route("/panelist/aggregate_scores")
+@cached_page
 def panelist_aggregate_scores():
     """Panelist Aggregate Scores Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     scores = aggregate_scores.retrieve_all_scores(database_connection)
     stats = aggregate_scores.calculate_stats(scores=scores)
     score_spread = aggregate_scores.retrieve_score_spread(database_connection)
@@ -241,56 +442,65 @@ def panelist_aggregate_scores():
                            score_spread=score_spread)
 
 @app.route("/panelist/appearances_by_year")
+@cached_page
 def panelist_appearances_by_year():
     """Panelist Appearances by Year Report"""
-    database_connection.reconnect()
-    panelists = appearances_by_year.retrieve_all_appearance_counts(database_connection)
-    show_years = appearances_by_year.retrieve_all_years(database_connection)
+    database_connection = get_database_connection()
+    appearance_matrix = appearances_by_year.retrieve_appearance_count_matrix(database_connection)
+    if not appearance_matrix:
+        return render_template("panelist/appearances_by_year.html",
+                               panelists=None,
+                               show_years=[])
 
     return render_template("panelist/appearances_by_year.html",
-                           panelists=panelists,
-                           show_years=show_years)
+                           panelists=appearance_matrix["panelists"],
+                           show_years=appearance_matrix["years"])
 
 @app.route("/panelist/bluff_stats")
+@cached_page
 def panelist_bluff_stats():
     """Panelist Bluff the Listener Statistics Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = bluff_stats.retrieve_all_panelist_bluff_stats(database_connection)
 
     return render_template("panelist/bluff_stats.html",
                            panelists=panelists)
 
 @app.route("/panelist/debut_by_year")
+@cached_page
 def panelist_debut_by_year():
     """Panelist Debut by Year Report"""
-    database_connection.reconnect()
-    years = debut_by_year.retrieve_show_years(database_connection)
+    database_connection = get_database_connection()
     debuts = debut_by_year.panelist_debuts_by_year(database_connection)
+    years = list(debuts.keys())
 
     return render_template("panelist/debut_by_year.html",
                            years=years,
                            debuts=debuts)
 
 @app.route("/panelist/first_most_recent_appearances")
+@cached_page
 def panelist_first_most_recent_appearances():
     """Panelist First and Most Recent Appearances Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists_appearances = appearances.retrieve_first_most_recent_appearances(database_connection)
 
     return render_template("panelist/first_most_recent_appearances.html",
                            panelists_appearances=panelists_appearances)
 
 @app.route("/panelist/gender_stats")
+@cached_page
 def panelist_gender_stats():
     """Panelist Statistics by Gender Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     stats = gender_stats.retrieve_stats_by_year_gender(database_connection)
     return render_template("panelist/gender_stats.html", gender_stats=stats)
 
 @app.route("/panelist/losing_streaks")
+@cached_page
 def panelist_losing_streaks():
     """Panelist Losing Streaks Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = streaks.retrieve_panelists(database_connection)
     losing_streaks = streaks.calculate_panelist_losing_streaks(panelists,
                                                                database_connection)
@@ -300,9 +510,18 @@ def panelist_losing_streaks():
                            losing_streaks=losing_streaks)
 
 @app.route("/panelist/panel_gender_mix")
+@app.route("/panelist/panel_gender_mix/<string:gender>")
+@cached_page
 def panelist_panel_gender_mix(gender: Optional[Text] = "female"):
     """Panel Gender Mix Report"""
-    database_connection.reconnect()
+    if gender in PANEL_GENDER_ALIASES:
+        return redirect(url_for("panelist_panel_gender_mix",
+                                gender=PANEL_GENDER_ALIASES[gender]), 301)
+
+    if gender not in PANEL_GENDERS:
+        abort(404)
+
+    database_connection = get_database_connection()
     gender_tag = gender[0].upper()
     mix = gender_mix.panel_gender_mix_breakdown(gender=gender,
                                                 database_connection=database_connection)
@@ -317,15 +536,13 @@ def panelist_pvp_redirect():
     return redirect(url_for("panelist_pvp_report"), 301)
 
 @app.route("/panelist/panelist_vs_panelist")
+@cached_page
 def panelist_pvp_report():
     """Panelist vs Panelist Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = pvp.retrieve_panelists(database_connection)
-    panelist_apps = pvp.retrieve_panelist_appearances(panelists=panelists,
-                                                      database_connection=database_connection)
     show_scores = pvp.retrieve_show_scores(database_connection)
     pvp_results = pvp.generate_panelist_vs_panelist_results(panelists=panelists,
-                                                            panelist_appearances=panelist_apps,
                                                             show_scores=show_scores)
 
     return render_template("panelist/panelist_vs_panelist.html",
@@ -333,9 +550,10 @@ def panelist_pvp_report():
                            results=pvp_results)
 
 @app.route("/panelist/panelist_vs_panelist_scoring", methods=["GET", "POST"])
+@cached_page
 def panelist_pvp_scoring():
     """Panelist vs Panelist Scoring Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = search_mult.retrieve_panelists(database_connection)
 
     if request.method == "POST":
@@ -355,13 +573,9 @@ def panelist_pvp_scoring():
             # Revert set back to list
             panelist_values = list(deduped_panelists)
             if len(panelist_values) == 2:
-                shows = pvp_scoring.retrieve_common_shows(database_connection,
+                scores = pvp_scoring.retrieve_pair_scores(database_connection,
                                                           panelist_values[0],
                                                           panelist_values[1])
-                scores = pvp_scoring.retrieve_panelists_scores(database_connection,
-                                                               shows,
-                                                               panelist_values[0],
-                                                               panelist_values[1])
                 return render_template("panelist/panelist_vs_panelist_scoring.html",
                                        panelists=panelists,
                                        valid_selections=True,
@@ -380,9 +594,10 @@ def panelist_pvp_scoring():
                            scores=None)
 
 @app.route("/panelist/rankings_summary")
+@cached_page
 def panelist_rankings_summary():
     """Panelist Rankings Summary Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = rankings_summary.retrieve_all_panelists(database_connection)
     rankings = rankings_summary.retrieve_all_panelist_rankings(database_connection)
     return render_template("panelist/rankings_summary.html",
@@ -390,18 +605,20 @@ def panelist_rankings_summary():
                            panelists_rankings=rankings)
 
 @app.route("/panelist/single_appearance")
+@cached_page
 def panelist_single_appearance():
     """Panelist Single Appearance Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = single.retrieve_single_appearances(database_connection)
     return render_template("panelist/single_appearance.html",
                            rank_map=RANK_MAP,
                            panelists_appearance=panelists)
 
 @app.route("/panelist/stats_summary")
+@cached_page
 def panelist_stats_summary():
     """Panelist Statistics Summary Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = stats_summary.retrieve_all_panelists(database_connection)
     stats = stats_summary.retrieve_all_panelists_stats(database_connection)
     return render_template("panelist/stats_summary.html",
@@ -409,9 +626,10 @@ def panelist_stats_summary():
                            panelists_stats=stats)
 
 @app.route("/panelist/win_streaks")
+@cached_page
 def panelist_win_streaks():
     """Panelist Win Streaks Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = streaks.retrieve_panelists(database_connection)
     win_streaks = streaks.calculate_panelist_win_streaks(panelists=panelists,
                                                          database_connection=database_connection)
@@ -434,24 +652,26 @@ def get_scorekeepers():
     return redirect(url_for("get_scorekeeper"), 301)
 
 @app.route("/scorekeeper/appearance_summary")
+@cached_page
 def scorekeeper_appearance_summary():
     """Scorekeeper Appearances Summary Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     summary = sk_appearances.retrieve_appearance_summaries(database_connection)
 
     return render_template("scorekeeper/appearance_summary.html",
                            summary=summary)
 
 @app.route("/scorekeeper/introductions")
+@cached_page
 def scorekeeper_introductions():
     """Scorekeeper Introductions Report"""
-    database_connection.reconnect()
-    scorekeepers = introductions.retrieve_scorekeepers_with_introductions(database_connection)
-    all_introductions = introductions.retrieve_all_scorekeeper_introductions(database_connection)
+    database_connection = get_database_connection()
+    scorekeeper_introductions = introductions.retrieve_scorekeeper_introductions(database_connection)
+    scorekeepers = [scorekeeper for scorekeeper, _ in scorekeeper_introductions]
 
     return render_template("scorekeeper/introductions.html",
                            scorekeepers=scorekeepers,
-                           all_introductions=all_introductions)
+                           scorekeeper_introductions=scorekeeper_introductions)
 
 #endregion
 
@@ -467,10 +687,11 @@ def get_shows():
     return redirect(url_for("get_show"), 301)
 
 @app.route("/show/all_shows")
+@cached_page(query_args=SORT_QUERY_ARGS)
 def show_all_shows():
     """All Shows Report"""
     ascending = True
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = show_details.retrieve_all_shows(database_connection)
     if "sort" in request.args:
         sort = str(request.args["sort"])
@@ -483,35 +704,39 @@ def show_all_shows():
                            shows=shows)
 
 @app.route("/show/all_women_panel")
+@cached_page
 def show_all_women_panel():
     """All Women Panel Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = all_women_panel.retrieve_shows_all_women_panel(database_connection)
 
     return render_template("/show/all_women_panel.html",
                            shows=shows)
 
 @app.route("/show/guest_hosts")
+@cached_page
 def show_guest_hosts():
     """Shows with Guest Hosts Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = guest_hosts.retrieve_shows_guest_host(database_connection)
 
     return render_template("/show/guest_hosts.html",
                            shows=shows)
 
 @app.route("/show/guest_scorekeepers")
+@cached_page
 def show_guest_scorekeepers():
     """Shows with Guest Scorekeepers Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = guest_scorekeeper.retrieve_shows_guest_scorekeeper(database_connection)
 
     return render_template("/show/guest_scorekeepers.html",
                            shows=shows)
 
 @app.route("/show/high_score_equal_sum_other_scores")
+@cached_page
 def show_high_score_equal_sum_other_scores():
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = scoring.retrieve_shows_panelist_score_sum_match(database_connection)
 
     return render_template("/show/high_score_equal_sum_other_scores.html",
@@ -519,17 +744,19 @@ def show_high_score_equal_sum_other_scores():
                            rank_map=RANK_MAP)
 
 @app.route("/show/high_scoring")
+@cached_page
 def show_high_scoring():
     """High Scoring Shows Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = scoring.retrieve_shows_all_high_scoring(database_connection)
 
     return render_template("/show/high_scoring.html", shows=shows)
 
 @app.route("/show/lightning_round_end_three_way_tie")
+@cached_page
 def show_lightning_round_end_three_way_tie():
     """Lightning Round Ending in Three-Way Tie Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = lightning_round.shows_ending_with_three_way_tie(database_connection)
 
     return render_template("/show/lightning_round_end_three_way_tie.html",
@@ -541,26 +768,29 @@ def show_lightning_round_score_start_redirect():
     return redirect(url_for("show_lightning_round_start_three_way_tie"), 301)
 
 @app.route("/show/lightning_round_start_end_three_way_tie")
+@cached_page
 def show_lightning_round_start_end_three_way_tie():
     """Lightning Round Starting and Ending in Three-Way Tie Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = lightning_round.shows_starting_ending_three_way_tie(database_connection)
     return render_template("/show/lightning_round_start_end_three_way_tie.html",
                            shows=shows)
 
 @app.route("/show/lightning_round_start_three_way_tie")
+@cached_page
 def show_lightning_round_start_three_way_tie():
     """Lightning Round Starting in Three-Way Tie Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = lightning_round.shows_starting_with_three_way_tie(database_connection)
 
     return render_template("/show/lightning_round_start_three_way_tie.html",
                            shows=shows)
 
 @app.route("/show/lightning_round_start_zero")
+@cached_page
 def show_lightning_round_start_zero():
     """Lightning Round Starting with Zero Points Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = lightning_round.shows_lightning_round_start_zero(database_connection)
 
     return render_template("/show/lightning_round_start_zero.html",
@@ -568,9 +798,10 @@ def show_lightning_round_start_zero():
                            rank_map=RANK_MAP)
 
 @app.route("/show/lightning_round_zero_correct")
+@cached_page
 def show_lightning_round_zero_correct():
     """Lightning Round Zero Correct Answers Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = lightning_round.show_lightning_round_zero_correct(database_connection)
 
     return render_template("/show/lightning_round_zero_correct.html",
@@ -578,18 +809,20 @@ def show_lightning_round_zero_correct():
                            rank_map=RANK_MAP)
 
 @app.route("/show/low_scoring")
+@cached_page
 def show_low_scoring():
     """Low Scoring Shows Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = scoring.retrieve_shows_all_low_scoring(database_connection)
 
     return render_template("/show/low_scoring.html", shows=shows)
 
 @app.route("/show/original_shows")
+@cached_page(query_args=SORT_QUERY_ARGS)
 def show_original_shows(ascending: Optional[bool] = True):
     """All Original Shows Report"""
     ascending = True
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     shows = show_details.retrieve_all_original_shows(database_connection)
 
     if "sort" in request.args:
@@ -613,9 +846,10 @@ def show_original_shows_desc():
     return redirect(url_for("show_original_shows", sort="desc"), 301)
 
 @app.route("/show/search_multiple_panelists", methods=["GET", "POST"])
+@cached_page
 def show_search_multiple_panelists():
     """Search Shows by Multiple Selected Panelists"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     panelists = search_mult.retrieve_panelists(database_connection)
 
     if request.method == "POST":
@@ -636,27 +870,18 @@ def show_search_multiple_panelists():
         if None in deduped_panelists:
             deduped_panelists.remove(None)
 
-        if len(deduped_panelists) > 0 and deduped_panelists <= panelists.keys():
-            # Revert set back to list
-            panelist_values = list(deduped_panelists)
-            if len(panelist_values) == 3:
-                shows = search_mult.retrieve_matching_three(database_connection,
-                                                            panelist_values[0],
-                                                            panelist_values[1],
-                                                            panelist_values[2],
-                                                            best_of,
-                                                            repeats)
-            elif len(panelist_values) == 2:
-                shows = search_mult.retrieve_matching_two(database_connection,
-                                                          panelist_values[0],
-                                                          panelist_values[1],
-                                                          best_of,
-                                                          repeats)
-            elif len(panelist_values) == 1:
-                shows = search_mult.retrieve_matching_one(database_connection,
-                                                          panelist_values[0],
-                                                          best_of,
-                                                          repeats)
+        # Parse the optional excluded panelist selection
+        exclude_panelists = set()
+        if request.form.get("exclude_panelist"):
+            exclude_panelists.add(request.form["exclude_panelist"])
+
+        if (len(deduped_panelists) > 0 and deduped_panelists <= panelists.keys()
+                and exclude_panelists <= panelists.keys()):
+            shows = search_mult.retrieve_matching_shows(database_connection,
+                                                        list(deduped_panelists),
+                                                        exclude_panelists,
+                                                        best_of,
+                                                        repeats)
 
             return render_template("/show/search_multiple_panelists.html",
                                    panelists=panelists,
@@ -673,9 +898,10 @@ def show_search_multiple_panelists():
                            shows=None)
 
 @app.route("/show/show_counts_by_year")
+@cached_page
 def show_counts_by_year():
     """Show Counts by Year Report"""
-    database_connection.reconnect()
+    database_connection = get_database_connection()
     counts = show_counts.retrieve_show_counts_by_year(database_connection)
 
     return render_template("/show/show_counts_by_year.html", show_counts=counts)
@@ -694,8 +920,29 @@ app.jinja_env.globals["current_year"] = utility.current_year
 
 app.jinja_env.globals["site_url"] = config["settings"]["site_url"]
 app.jinja_env.globals["stats_url"] = config["settings"]["stats_url"]
-database_connection = mysql.connector.connect(**config["database"])
-database_connection.autocommit = True
+database_pool = database.ConnectionPool(config["database"])
+
+if "data_version_check_interval" in config["settings"]:
+    data_version.probe.check_interval = int(config["settings"]["data_version_check_interval"])
+
+data_version.probe.time_zone = app_time_zone
+template_version = utility.directory_checksum(os.path.join(app.root_path,
+                                                           app.template_folder))
+default_cache_control = config["settings"].get("cache_control",
+                                               DEFAULT_CACHE_CONTROL)
+route_cache_controls = config["settings"].get("route_cache_control", {})
+
+static_files = compression.precompress_directory(os.path.join(app.static_folder, "css"),
+                                                  app.static_folder)
+app.view_functions["static"] = send_static_file
+
+rendered_pages = page_cache.PageCache(
+    max_entries=int(config["settings"].get("page_cache_max_entries",
+                                           page_cache.DEFAULT_MAX_ENTRIES)),
+    max_age=int(config["settings"].get("page_cache_max_age",
+                                       page_cache.DEFAULT_MAX_AGE)),
+    enabled=bool(config["settings"].get("page_cache_enabled", True))
+)
 
 if __name__ == "__main__":
     app.run(debug=False, host="0.0.0.0", port="9248")
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""In-memory result caches used by the Reports Site"""
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = 256
+
+#region Cache Classes
+class VersionedLRUCache:
+    """Thread-safe least recently used cache where each value is stored
+    along with the data version it was generated from. Values from an
+    older data version, or older than the optional maximum age in
+    seconds, are treated as missing"""
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: str, default: Any = None) -> Any:
+        """Return the cached value for the key if it was generated from
+        the current data version and has not expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            entry_version, created, value = entry
+            if entry_version != version or (
+                    self.max_age is not None
+                    and time.monotonic() - created > self.max_age):
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, version: str, value: Any) -> Any:
+        """Store a value in the cache, evicting the least recently used
+        entries once the cache is full"""
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all cached values"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+#endregion
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Response compression functions used by the Reports Site"""
+
+from collections import OrderedDict
+import gzip
+from hashlib import sha1
+import os
+from typing import Dict, Iterable
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IDENTITY = "identity"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+STATIC_EXTENSIONS = (".css", )
+
+# Supported encodings in order of preference
+ENCODINGS = ("br", "gzip") if brotli else ("gzip", )
+
+#region Compression Functions
+def compress_variants(body: bytes,
+                      encodings: Iterable[str] = ENCODINGS) -> Dict[str, bytes]:
+    """Return the uncompressed body along with a compressed variant
+    for each requested supported content encoding"""
+    variants = OrderedDict()
+    variants[IDENTITY] = body
+    if brotli and "br" in encodings:
+        variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    if "gzip" in encodings:
+        variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    return variants
+
+def select_encoding(accept_encodings,
+                    available: Iterable[str] = ENCODINGS) -> str:
+    """Return the preferred available content encoding allowed by the
+    request's Accept-Encoding header, or identity if none are"""
+    best_encoding = IDENTITY
+    best_quality = 0
+    for encoding in available:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best_encoding = encoding
+            best_quality = quality
+
+    return best_encoding
+
+#endregion
+
+#region Precompressed File Classes
+class PrecompressedFile:
+    """File contents along with compressed variants, a checksum and
+    the file modification time"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file_object:
+            body = file_object.read()
+
+        self.variants = compress_variants(body)
+        self.checksum = sha1(body).hexdigest()
+        self.modified = os.path.getmtime(path)
+
+def precompress_directory(path: str, relative_to: str,
+                          extensions: Iterable[str] = STATIC_EXTENSIONS
+                         ) -> Dict[str, PrecompressedFile]:
+    """Read and compress all files with the requested extensions under
+    a directory. Returns a dictionary keyed by each file's path relative
+    to relative_to, using forward slashes"""
+    files = {}
+    extensions = tuple(extensions)
+    for root, _, file_names in os.walk(path):
+        for file_name in file_names:
+            if not file_name.endswith(extensions):
+                continue
+
+            file_path = os.path.join(root, file_name)
+            relative_path = os.path.relpath(file_path, relative_to).replace(os.sep, "/")
+            files[relative_path] = PrecompressedFile(file_path)
+
+    return files
+
+#endregion
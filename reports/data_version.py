@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Data version probe used to detect changes to the Stats Page data"""
+
+from datetime import datetime
+from hashlib import sha1
+import threading
+import time
+from typing import Optional, Tuple
+import mysql.connector
+import pytz
+
+DEFAULT_CHECK_INTERVAL = 60
+
+#region Retrieval Functions
+def retrieve_data_version_info(database_connection: mysql.connector.connect
+                              ) -> Tuple[Optional[str], Optional[datetime]]:
+    """Retrieve a version string derived from the most recent show ID,
+    row counts and score totals of the core tables and the latest table
+    update time reported by the database, along with that update time.
+
+    The query only reads aggregates and table metadata so that it stays
+    cheap enough to run in the request path. Edits that leave every
+    count and total unchanged are picked up through the table update
+    time, which some MySQL versions cache for a while"""
+
+    cursor = database_connection.cursor()
+    query = ("SELECT (SELECT MAX(showid) FROM ww_shows), "
+             "(SELECT COUNT(*) FROM ww_shows), "
+             "(SELECT COUNT(*) FROM ww_showpnlmap), "
+             "(SELECT SUM(panelistscore) FROM ww_showpnlmap), "
+             "(SELECT COUNT(*) FROM ww_panelists), "
+             "(SELECT COUNT(*) FROM ww_showguestmap), "
+             "(SELECT SUM(guestscore) FROM ww_showguestmap), "
+             "(SELECT COUNT(*) FROM ww_showhostmap), "
+             "(SELECT COUNT(*) FROM ww_showskmap), "
+             "(SELECT COUNT(*) FROM ww_showlocationmap), "
+             "(SELECT COUNT(*) FROM ww_showbluffmap), "
+             "(SELECT COUNT(*) FROM ww_guests), "
+             "(SELECT COUNT(*) FROM ww_hosts), "
+             "(SELECT COUNT(*) FROM ww_scorekeepers), "
+             "(SELECT COUNT(*) FROM ww_locations), "
+             "(SELECT MAX(UPDATE_TIME) FROM information_schema.TABLES "
+             "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE 'ww\\_%');")
+    cursor.execute(query)
+    result = cursor.fetchone()
+    cursor.close()
+
+    if not result:
+        return None, None
+
+    checksum = sha1("|".join(str(value) for value in result).encode("utf-8"))
+    update_time = result[-1] if isinstance(result[-1], datetime) else None
+    return checksum.hexdigest(), update_time
+
+def retrieve_data_version(database_connection: mysql.connector.connect
+                         ) -> Optional[str]:
+    """Retrieve a version string derived from the most recent show ID,
+    row counts and score totals of the core tables and the latest table
+    update time reported by the database"""
+
+    version, _ = retrieve_data_version_info(database_connection)
+    return version
+
+#endregion
+
+#region Data Version Probe Class
+class DataVersionProbe:
+    """Caches the current data version and only re-runs the version
+    query once the check interval has elapsed"""
+
+    def __init__(self, check_interval: int = DEFAULT_CHECK_INTERVAL,
+                 time_zone: pytz.timezone = pytz.utc):
+        self.check_interval = check_interval
+        self.time_zone = time_zone
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._last_modified = None
+
+    def cached(self) -> Optional[str]:
+        """Return the cached data version if it was checked within the
+        check interval, otherwise None"""
+        with self._lock:
+            if self._version and time.monotonic() - self._checked_at < self.check_interval:
+                return self._version
+
+        return None
+
+    def current(self, database_connection: mysql.connector.connect
+               ) -> Optional[str]:
+        """Return the current data version, querying the database if
+        the cached version is older than the check interval"""
+        version = self.cached()
+        if version:
+            return version
+
+        version, update_time = retrieve_data_version_info(database_connection)
+        with self._lock:
+            if version != self._version or self._last_modified is None:
+                self._last_modified = self._modified_time(update_time)
+
+            self._version = version
+            self._checked_at = time.monotonic()
+
+        return version
+
+    def last_modified(self) -> Optional[datetime]:
+        """Return the UTC time the data was last modified: the latest
+        table update time reported by the database, or the time the
+        current data version was first seen if the database does not
+        report update times"""
+        with self._lock:
+            return self._last_modified
+
+    def _modified_time(self, update_time: Optional[datetime]) -> datetime:
+        """Convert a database update time, in the configured time zone,
+        into a UTC time no later than now"""
+        now = datetime.now(pytz.utc).replace(microsecond=0)
+        if update_time is None:
+            return now
+
+        if update_time.tzinfo is None:
+            update_time = self.time_zone.localize(update_time)
+
+        return min(update_time.astimezone(pytz.utc).replace(microsecond=0), now)
+
+    def expire(self) -> None:
+        """Force the next call to current() to query the database"""
+        with self._lock:
+            self._checked_at = 0.0
+
+#endregion
+
+probe = DataVersionProbe()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Database connection pool used by the Reports Site"""
+
+from contextlib import contextmanager
+import queue
+import threading
+from typing import Dict, Iterator, Optional
+import mysql.connector
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_TIMEOUT = 30
+
+#region Connection Pool Class
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections that are created lazily,
+    validated with a ping when checked out and returned for re-use
+    once a request has been completed"""
+
+    def __init__(self, database_config: Dict):
+        """Create a new connection pool from the database section of
+        config.json. The ``pool_size`` and ``pool_timeout`` keys are
+        consumed by the pool and are not passed to the connector"""
+        self._config = dict(database_config)
+        self.pool_size = int(self._config.pop("pool_size", DEFAULT_POOL_SIZE)
+                             or DEFAULT_POOL_SIZE)
+        self.pool_timeout = self._config.pop("pool_timeout", DEFAULT_POOL_TIMEOUT)
+        self._idle = queue.LifoQueue(maxsize=self.pool_size)
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _create_connection(self) -> mysql.connector.connect:
+        """Open a new database connection with autocommit enabled"""
+        connection = mysql.connector.connect(**self._config)
+        connection.autocommit = True
+        return connection
+
+    def _discard(self, connection: mysql.connector.connect) -> None:
+        """Close a connection and free up its slot in the pool"""
+        try:
+            connection.close()
+        except mysql.connector.Error:
+            pass
+
+        with self._lock:
+            self._created -= 1
+
+    def acquire(self) -> mysql.connector.connect:
+        """Check out a healthy connection from the pool, creating a new
+        connection if the pool has not yet reached its maximum size"""
+        connection = None
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.pool_size
+                if can_create:
+                    self._created += 1
+
+            if can_create:
+                try:
+                    return self._create_connection()
+                except mysql.connector.Error:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+            try:
+                connection = self._idle.get(timeout=self.pool_timeout)
+            except queue.Empty as error:
+                raise mysql.connector.errors.PoolError(
+                    "No database connections available in the pool"
+                ) from error
+
+        # Only re-establish the connection if the ping fails
+        try:
+            connection.ping(reconnect=True, attempts=2, delay=0)
+        except mysql.connector.Error:
+            self._discard(connection)
+            raise
+
+        return connection
+
+    def release(self, connection: Optional[mysql.connector.connect]) -> None:
+        """Return a connection to the pool"""
+        if connection is None:
+            return
+
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            self._discard(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[mysql.connector.connect]:
+        """Context manager that checks out a connection and returns it
+        to the pool when the block exits"""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self) -> None:
+        """Close all idle connections currently held by the pool"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+#endregion
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Grouped statistics functions used by the Reports Site"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Sequence
+import numpy
+
+DEFAULT_PERCENTILES = (25, 75)
+
+#region Grouped Statistics Functions
+def group_codes(group_keys: Sequence[numpy.ndarray]):
+    """Combine one or more group key arrays into a single array of
+    integer group codes and return the codes along with the key for
+    each code"""
+
+    if len(group_keys) == 1:
+        keys, codes = numpy.unique(group_keys[0], return_inverse=True)
+        return codes, keys.tolist()
+
+    uniques = []
+    inverses = []
+    for key_array in group_keys:
+        unique, inverse = numpy.unique(key_array, return_inverse=True)
+        uniques.append(unique.tolist())
+        inverses.append(inverse)
+
+    combined = numpy.ravel_multi_index(inverses, [len(unique) for unique in uniques])
+    combined_keys, codes = numpy.unique(combined, return_inverse=True)
+    key_indices = numpy.unravel_index(combined_keys, [len(unique) for unique in uniques])
+    keys = list(zip(*[[uniques[axis][index] for index in indices]
+                      for axis, indices in enumerate(key_indices)]))
+    return codes, keys
+
+def grouped_statistics(values: Iterable,
+                       *group_keys: Iterable,
+                       percentiles: Sequence[float] = DEFAULT_PERCENTILES
+                      ) -> Dict:
+    """Calculate count, minimum, maximum, mean, median, standard
+    deviation, total and the requested percentiles of the values for
+    every group using a single sort of the values.
+
+    One or more group key arrays of the same length as the values can
+    be passed in; with more than one key array, groups are keyed by a
+    tuple of the key values. Returns an OrderedDict of statistics for
+    each group, in sorted key order. Percentiles and medians use linear
+    interpolation, the same as numpy.percentile, and the standard
+    deviation is the population standard deviation, the same as
+    numpy.std"""
+
+    values = numpy.asarray(values, dtype=numpy.float64)
+    if not group_keys:
+        group_keys = (numpy.zeros(len(values), dtype=numpy.int64),)
+
+    group_keys = [numpy.asarray(key_array) for key_array in group_keys]
+    all_stats = OrderedDict()
+    if not len(values):
+        return all_stats
+
+    codes, keys = group_codes(group_keys)
+
+    # Sort by group and then by value so each group is a contiguous,
+    # ordered run of values
+    order = numpy.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+
+    counts = numpy.bincount(codes, minlength=len(keys))
+    starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+    ends = starts + counts - 1
+
+    totals = numpy.add.reduceat(sorted_values, starts)
+    means = totals / counts
+    deviations = (sorted_values - means[sorted_codes]) ** 2
+    standard_deviations = numpy.sqrt(numpy.add.reduceat(deviations, starts) / counts)
+
+    def percentile(quantile: float) -> numpy.ndarray:
+        position = (counts - 1) * (quantile / 100)
+        lower = numpy.floor(position).astype(numpy.int64)
+        upper = numpy.ceil(position).astype(numpy.int64)
+        lower_values = sorted_values[starts + lower]
+        upper_values = sorted_values[starts + upper]
+        return lower_values + (upper_values - lower_values) * (position - lower)
+
+    medians = percentile(50)
+    percentile_values = OrderedDict((quantile, percentile(quantile))
+                                    for quantile in percentiles)
+
+    minimums = sorted_values[starts]
+    maximums = sorted_values[ends]
+    for code, key in enumerate(keys):
+        stats = OrderedDict()
+        stats["count"] = int(counts[code])
+        stats["minimum"] = float(minimums[code])
+        stats["maximum"] = float(maximums[code])
+        stats["mean"] = float(means[code])
+        stats["median"] = float(medians[code])
+        stats["standard_deviation"] = float(standard_deviations[code])
+        stats["total"] = float(totals[code])
+        stats["percentiles"] = OrderedDict(
+            (quantile, float(quantile_values[code]))
+            for quantile, quantile_values in percentile_values.items()
+        )
+        all_stats[key] = stats
+
+    return all_stats
+
+def format_statistics(stats: Dict) -> Dict:
+    """Convert grouped statistics into the rounded and integer values
+    displayed on reports"""
+
+    formatted = OrderedDict()
+    formatted["minimum"] = int(stats["minimum"])
+    formatted["maximum"] = int(stats["maximum"])
+    formatted["mean"] = round(stats["mean"], 4)
+    formatted["median"] = int(stats["median"])
+    formatted["standard_deviation"] = round(stats["standard_deviation"], 4)
+    formatted["count"] = stats["count"]
+    formatted["total"] = int(stats["total"])
+    formatted["percentiles"] = OrderedDict(
+        (quantile, round(value, 4)) for quantile, value in stats["percentiles"].items()
+    )
+
+    return formatted
+
+#endregion
@@ -8,28 +8,29 @@ from typing import List, Dict
 import mysql.connector
 
 #region Retrieval Functions
-def retrieve_guest_appearances(guest_id: int,
-                               database_connection: mysql.connector.connect
-                              ) -> List[Dict]:
-    """Retrieve a list of shows in which the requested Not My Job guest
-    has made an appearance on (including Best Of and Repeats)"""
+def retrieve_guest_appearances_by_guest_ids(guest_ids: List[int],
+                                            database_connection: mysql.connector.connect
+                                           ) -> Dict[int, List[Dict]]:
+    """Retrieve lists of shows in which each of the requested Not My Job
+    guests has made an appearance on (including Best Of and Repeats)
+    using a single query. Returns a dictionary keyed by guest ID"""
+
+    guest_shows = {}
+    guest_ids = list(dict.fromkeys(guest_ids))
+    if not guest_ids:
+        return guest_shows
 
-    shows = []
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, s.bestof, s.repeatshowid, "
-             "gm.guestscore, gm.exception "
+    query = ("SELECT gm.guestid, s.showid, s.showdate, s.bestof, "
+             "s.repeatshowid, gm.guestscore, gm.exception "
              "FROM ww_showguestmap gm "
              "JOIN ww_shows s ON s.showid = gm.showid "
-             "JOIN ww_guests g ON g.guestid = gm.guestid "
-             "WHERE g.guestid = %s "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (guest_id,))
+             "WHERE gm.guestid IN ({}) "
+             "ORDER BY s.showdate ASC;".format(", ".join(["%s"] * len(guest_ids))))
+    cursor.execute(query, tuple(guest_ids))
     result = cursor.fetchall()
     cursor.close()
 
-    if not result:
-        return None
-
     for row in result:
         show = OrderedDict()
         show["id"] = row["showid"]
@@ -38,9 +39,19 @@ def retrieve_guest_appearances(guest_id: int,
         show["repeat_show"] = bool(row["repeatshowid"])
         show["score"] = row["guestscore"]
         show["exception"] = bool(row["exception"])
-        shows.append(show)
+        guest_shows.setdefault(row["guestid"], []).append(show)
 
-    return shows
+    return guest_shows
+
+def retrieve_guest_appearances(guest_id: int,
+                               database_connection: mysql.connector.connect
+                              ) -> List[Dict]:
+    """Retrieve a list of shows in which the requested Not My Job guest
+    has made an appearance on (including Best Of and Repeats)"""
+
+    guest_shows = retrieve_guest_appearances_by_guest_ids([guest_id],
+                                                          database_connection)
+    return guest_shows.get(guest_id)
 
 def retrieve_best_of_only_guests(database_connection: mysql.connector.connect
                                 ) -> List[Dict]:
@@ -70,13 +81,16 @@ def retrieve_best_of_only_guests(database_connection: mysql.connector.connect
     if not result:
         return None
 
+    guest_shows = retrieve_guest_appearances_by_guest_ids(
+        [row["guestid"] for row in result], database_connection
+    )
+
     for row in result:
         guest = OrderedDict()
         guest["id"] = row["guestid"]
         guest["name"] = row["guest"]
         guest["slug"] = row["guestslug"]
-        guest["appearances"] = retrieve_guest_appearances(guest_id=guest["id"],
-                                                          database_connection=database_connection)
+        guest["appearances"] = guest_shows.get(guest["id"])
         guests.append(guest)
 
     return guests
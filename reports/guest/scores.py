@@ -8,31 +8,32 @@ from typing import List, Dict
 import mysql.connector
 
 #region Retrieval Functions
-def retrieve_scoring_exceptions(guest_id: int,
-                                database_connection: mysql.connector.connect
-                               ) -> List[Dict]:
-    """Retrieve a list of instances where a requested Not My Job guest
-    has had a scoring exception"""
+def retrieve_scoring_exceptions_by_guest_ids(guest_ids: List[int],
+                                             database_connection: mysql.connector.connect
+                                            ) -> Dict[int, List[Dict]]:
+    """Retrieve lists of instances where each of the requested Not My
+    Job guests has had a scoring exception using a single query.
+    Returns a dictionary keyed by guest ID"""
+
+    guest_exceptions = {}
+    guest_ids = list(dict.fromkeys(guest_ids))
+    if not guest_ids:
+        return guest_exceptions
 
-    exceptions = []
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT g.guestid, g.guest, s.showid, s.showdate, "
+    query = ("SELECT gm.guestid, s.showid, s.showdate, "
              "gm.guestscore, gm.exception, sn.shownotes "
              "FROM ww_showguestmap gm "
              "JOIN ww_shows s ON s.showid = gm.showid "
-             "JOIN ww_guests g ON g.guestid = gm.guestid "
              "JOIN ww_shownotes sn on sn.showid = gm.showid "
-             "WHERE g.guestid = %s "
+             "WHERE gm.guestid IN ({}) "
              "AND s.bestof = 0 AND s.repeatshowid IS NULL "
              "AND gm.exception = 1 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (guest_id,))
+             "ORDER BY s.showdate ASC;".format(", ".join(["%s"] * len(guest_ids))))
+    cursor.execute(query, tuple(guest_ids))
     result = cursor.fetchall()
     cursor.close()
 
-    if not result:
-        return None
-
     for row in result:
         show = OrderedDict()
         show["id"] = row["showid"]
@@ -40,9 +41,19 @@ def retrieve_scoring_exceptions(guest_id: int,
         show["score"] = row["guestscore"]
         show["exception"] = bool(row["exception"])
         show["notes"] = row["shownotes"]
-        exceptions.append(show)
+        guest_exceptions.setdefault(row["guestid"], []).append(show)
 
-    return exceptions
+    return guest_exceptions
+
+def retrieve_scoring_exceptions(guest_id: int,
+                                database_connection: mysql.connector.connect
+                               ) -> List[Dict]:
+    """Retrieve a list of instances where a requested Not My Job guest
+    has had a scoring exception"""
+
+    guest_exceptions = retrieve_scoring_exceptions_by_guest_ids([guest_id],
+                                                                database_connection)
+    return guest_exceptions.get(guest_id)
 
 def retrieve_guest_scores(guest_id: int,
                           database_connection: mysql.connector.connect
@@ -102,13 +113,16 @@ def retrieve_all_scoring_exceptions(database_connection: mysql.connector.connect
     if not result:
         return None
 
+    guest_exceptions = retrieve_scoring_exceptions_by_guest_ids(
+        [row["guestid"] for row in result], database_connection
+    )
+
     for row in result:
         guest = OrderedDict()
         guest["id"] = row["guestid"]
         guest["name"] = row["guest"]
         guest["slug"] = row["guestslug"]
-        guest["exceptions"] = retrieve_scoring_exceptions(guest_id=guest["id"],
-                                                          database_connection=database_connection)
+        guest["exceptions"] = guest_exceptions.get(guest["id"])
         exceptions.append(guest)
 
     return exceptions
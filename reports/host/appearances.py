@@ -7,6 +7,8 @@ from collections import OrderedDict
 from typing import Dict, List, Text
 import mysql.connector
 
+from reports import role_appearances
+
 #region Retrieval Functions
 def retrieve_all_hosts(database_connection: mysql.connector.connect
                       ) -> List[Dict]:
@@ -38,28 +40,16 @@ def retrieve_appearances_by_host(host_slug: Text,
                                 ) -> Dict:
     """Retrieve appearance data for the requested host"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT ( "
-             "SELECT COUNT(hm.showid) FROM ww_showhostmap hm "
-             "JOIN ww_shows s ON s.showid = hm.showid "
-             "JOIN ww_hosts h ON h.hostid = hm.hostid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL AND "
-             "h.hostslug = %s ) AS regular, ( "
-             "SELECT COUNT(hm.showid) FROM ww_showhostmap hm "
-             "JOIN ww_shows s ON s.showid = hm.showid "
-             "JOIN ww_hosts h ON h.hostid = hm.hostid "
-             "WHERE h.hostslug = %s ) AS allshows;")
-    cursor.execute(query, (host_slug,
-                           host_slug, ))
-    result = cursor.fetchone()
-    cursor.close()
-
-    if not result:
+    summaries = role_appearances.retrieve_role_appearance_summaries(
+        role_appearances.HOST, database_connection, slug=host_slug
+    )
+    if not summaries:
         return None
 
+    summary = next(iter(summaries.values()))
     appearances = OrderedDict()
-    appearances["regular"] = result["regular"]
-    appearances["all"] = result["allshows"]
+    appearances["regular"] = summary["regular_shows"]
+    appearances["all"] = summary["all_shows"]
 
     return appearances
 
@@ -69,67 +59,28 @@ def retrieve_first_most_recent_appearances(host_slug: Text,
     """Retrieve first and most recent appearances for both regular
     and all shows for the requested host"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT MIN(s.showdate) AS min, MAX(s.showdate) AS max "
-             "FROM ww_showhostmap hm "
-             "JOIN ww_shows s ON s.showid = hm.showid "
-             "JOIN ww_hosts h ON h.hostid = hm.hostid "
-             "WHERE h.hostslug = %s "
-             "AND s.bestof = 0 "
-             "AND s.repeatshowid IS null;")
-    cursor.execute(query, (host_slug, ))
-    result = cursor.fetchone()
-
-    if not result:
+    summaries = role_appearances.retrieve_role_appearance_summaries(
+        role_appearances.HOST, database_connection, slug=host_slug
+    )
+    if not summaries:
         return None
 
+    summary = next(iter(summaries.values()))
     appearance_info = OrderedDict()
-    appearance_info["first"] = result["min"].isoformat()
-    appearance_info["most_recent"] = result["max"].isoformat()
-
-    query = ("SELECT MIN(s.showdate) AS min, MAX(s.showdate) AS max "
-             "FROM ww_showhostmap hm "
-             "JOIN ww_shows s ON s.showid = hm.showid "
-             "JOIN ww_hosts h ON h.hostid = hm.hostid "
-             "WHERE h.hostslug = %s;")
-    cursor.execute(query, (host_slug, ))
-    result = cursor.fetchone()
-    cursor.close()
-
-    if not result:
-        return appearance_info
-
-    appearance_info["first_all"] = result["min"].isoformat()
-    appearance_info["most_recent_all"] = result["max"].isoformat()
+    appearance_info["first"] = summary["first"]
+    appearance_info["most_recent"] = summary["most_recent"]
+    appearance_info["first_all"] = summary["first_all"]
+    appearance_info["most_recent_all"] = summary["most_recent_all"]
 
     return appearance_info
 
 def retrieve_appearance_summaries(database_connection: mysql.connector.connection
                                  ) -> List[Dict]:
-    """Retrieve host appearance summary, including appearance counts,
-    and first and most recent appearances"""
-    hosts = retrieve_all_hosts(database_connection)
-
-    if not hosts:
-        return None
+    """Retrieve host appearance summary, including appearance
+    counts, and first and most recent appearances, for all hosts in
+    a single query"""
 
-    hosts_summary = OrderedDict()
-    for host in hosts:
-        appearance_count = retrieve_appearances_by_host(host["slug"],
-                                                        database_connection)
-        first_most_recent = retrieve_first_most_recent_appearances(host["slug"],
-                                                                   database_connection)
-        info = OrderedDict()
-        info["slug"] = host["slug"]
-        info["name"] = host["name"]
-        info["regular_shows"] = appearance_count["regular"]
-        info["all_shows"] = appearance_count["all"]
-        info["first"] = first_most_recent["first"]
-        info["first_all"] = first_most_recent["first_all"]
-        info["most_recent"] = first_most_recent["most_recent"]
-        info["most_recent_all"] = first_most_recent["most_recent_all"]
-        hosts_summary[host["slug"]] = info
-
-    return hosts_summary
+    return role_appearances.retrieve_role_appearance_summaries(role_appearances.HOST,
+                                                               database_connection)
 
 #endregion
@@ -3,6 +3,9 @@
 # reports.wwdt.me is released under the terms of the Apache License 2.0
 """Explicitly listing all location reporting modules"""
 
-from reports.location import average_scores
+from reports.location import analytics, average_scores
 
-__all__ = ["average_scores"]
+__all__ = [
+    "analytics",
+    "average_scores"
+]
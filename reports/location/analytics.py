@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""WWDTM Location Score Analytics Functions"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Text
+import mysql.connector
+import numpy
+
+from reports import data_version
+from reports.cache import VersionedLRUCache
+from reports.grouped_stats import group_codes, grouped_statistics
+
+# Groupings calculated for every set of location scores, each made up
+# of one or more of the location, state and year key columns
+GROUPINGS = OrderedDict([
+    ("location", ("location", )),
+    ("state", ("state", )),
+    ("year", ("year", )),
+    ("location_year", ("location", "year")),
+    ("state_year", ("state", "year")),
+])
+
+#region Location Analytics Class
+class LocationAnalytics:
+    """Panelist scores for every regular show, along with each show's
+    location, state and year, and the score statistics for each of the
+    location, state and year groupings"""
+
+    def __init__(self, rows: Sequence[Dict], version: Optional[str] = None):
+        self.version = version
+        self.locations = OrderedDict()
+        for row in rows:
+            if row["locationid"] not in self.locations:
+                location = OrderedDict()
+                location["id"] = row["locationid"]
+                location["venue"] = row["venue"]
+                location["city"] = row["city"]
+                location["state"] = row["state"]
+                self.locations[row["locationid"]] = location
+
+        self.columns = {
+            "location": numpy.array([row["locationid"] for row in rows],
+                                    dtype=numpy.int64),
+            "state": numpy.array([row["state"] or "" for row in rows],
+                                 dtype=str),
+            "year": numpy.array([row["showdate"].year for row in rows],
+                                dtype=numpy.int64),
+        }
+        self.show_id = numpy.array([row["showid"] for row in rows],
+                                   dtype=numpy.int64)
+        self.score = numpy.array([numpy.nan if row["panelistscore"] is None
+                                  else row["panelistscore"] for row in rows],
+                                 dtype=numpy.float64)
+
+        self.statistics = OrderedDict()
+        for grouping, key_names in GROUPINGS.items():
+            self.statistics[grouping] = self._calculate(key_names)
+
+    def _calculate(self, key_names: Sequence[Text]) -> Dict:
+        """Calculate score statistics, appearance and show counts and
+        the score distribution for each group of the requested key
+        columns. Group codes are calculated once; counts use bincount
+        and only the scores are passed to grouped_statistics"""
+
+        if not len(self.show_id):
+            return OrderedDict()
+
+        codes, keys = group_codes([self.columns[name] for name in key_names])
+        has_score = ~numpy.isnan(self.score)
+
+        # Every key column is a property of the show, so the first row of
+        # each show stands in for the show when counting shows
+        _, show_rows = numpy.unique(self.show_id, return_index=True)
+
+        appearances = numpy.bincount(codes, minlength=len(keys))
+        shows = numpy.bincount(codes[show_rows], minlength=len(keys))
+        scores = grouped_statistics(self.score[has_score], codes[has_score])
+
+        # Count each score within each group using a single bincount over
+        # combined group and score codes
+        score_values = self.score[has_score].astype(numpy.int64)
+        lowest_score = int(score_values.min()) if len(score_values) else 0
+        score_range = int(score_values.max()) - lowest_score + 1 if len(score_values) else 1
+        distribution = numpy.bincount(
+            codes[has_score] * score_range + (score_values - lowest_score),
+            minlength=len(keys) * score_range
+        ).reshape(len(keys), score_range)
+
+        groups = OrderedDict()
+        for code, key in enumerate(keys):
+            info = OrderedDict()
+            info["appearances"] = int(appearances[code])
+            info["show_count"] = int(shows[code])
+            stats = scores.get(code)
+            if stats:
+                info["score_count"] = stats["count"]
+                info["average_score"] = stats["mean"]
+                info["median_score"] = stats["median"]
+                info["minimum_score"] = int(stats["minimum"])
+                info["maximum_score"] = int(stats["maximum"])
+                info["spread"] = int(stats["maximum"] - stats["minimum"])
+                info["standard_deviation"] = stats["standard_deviation"]
+                info["total_score"] = int(stats["total"])
+                info["average_total"] = stats["total"] / info["show_count"]
+                info["percentiles"] = stats["percentiles"]
+            else:
+                info["score_count"] = 0
+                info["average_score"] = None
+                info["median_score"] = None
+                info["minimum_score"] = None
+                info["maximum_score"] = None
+                info["spread"] = None
+                info["standard_deviation"] = None
+                info["total_score"] = 0
+                info["average_total"] = None
+                info["percentiles"] = None
+
+            info["distribution"] = OrderedDict(
+                (lowest_score + offset, int(count))
+                for offset, count in enumerate(distribution[code].tolist())
+                if count
+            )
+            groups[key] = info
+
+        return groups
+
+    def grouping(self, name: Text) -> Dict:
+        """Return the statistics for the requested grouping, keyed by
+        location ID, state, year or a tuple of those"""
+        return self.statistics[name]
+
+#endregion
+
+#region Retrieval Functions
+_analytics_cache = VersionedLRUCache(max_entries=1)
+
+def load_location_analytics(database_connection: mysql.connector.connect,
+                            version: Optional[str] = None
+                           ) -> LocationAnalytics:
+    """Load every panelist score for regular shows along with the show
+    location, excluding TBD locations and the 25th Anniversary Show, and
+    calculate location analytics"""
+
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT l.locationid, l.venue, l.city, l.state, s.showid, "
+             "s.showdate, pm.panelistscore "
+             "FROM ww_showpnlmap pm "
+             "JOIN ww_shows s ON s.showid = pm.showid "
+             "JOIN ww_showlocationmap lm ON lm.showid = pm.showid "
+             "JOIN ww_locations l ON l.locationid = lm.locationid "
+             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
+             "AND l.locationid <> 3 " # Ignore any TBD locations
+             "AND s.showdate <> '2018-10-27' "
+             "ORDER BY s.showdate ASC, pm.showpnlmapid ASC;")
+    cursor.execute(query)
+    result = cursor.fetchall()
+    cursor.close()
+
+    return LocationAnalytics(result, version=version)
+
+def retrieve_location_analytics(database_connection: mysql.connector.connect
+                               ) -> LocationAnalytics:
+    """Return location analytics for the current data version, loading
+    and calculating them again only when the data changes"""
+
+    version = data_version.probe.current(database_connection)
+    analytics = _analytics_cache.get("analytics", version)
+    if analytics is None:
+        analytics = _analytics_cache.set("analytics", version,
+                                         load_location_analytics(database_connection,
+                                                                 version))
+
+    return analytics
+
+#endregion
@@ -3,53 +3,119 @@
 # reports.wwdt.me is released under the terms of the Apache License 2.0
 """WWDTM Location Score Breakdown Report Functions"""
 
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from decimal import Decimal
 from typing import List, Dict
 import mysql.connector
 
+from reports.location.analytics import retrieve_location_analytics
+
 #region Retrieval Functions
+def _decimal(value: float) -> Decimal:
+    """Convert a calculated value into a normalized Decimal rounded to
+    four decimal places, matching the precision of MySQL averages"""
+    return Decimal(str(round(value, 4))).normalize()
+
+def _location_scores(info: Dict) -> Dict:
+    """Build the score statistics displayed for a location, state or
+    year group"""
+
+    scores = OrderedDict()
+    scores["show_count"] = info["show_count"]
+    scores["average_score"] = _decimal(info["average_score"])
+    scores["median_score"] = _decimal(info["median_score"])
+    scores["average_total"] = _decimal(info["average_total"])
+    scores["minimum_score"] = info["minimum_score"]
+    scores["maximum_score"] = info["maximum_score"]
+    scores["spread"] = info["spread"]
+    scores["standard_deviation"] = _decimal(info["standard_deviation"])
+    scores["distribution"] = info["distribution"]
+    return scores
+
 def retrieve_average_scores_by_location(database_connection: mysql.connector.connect
                                        ) -> List[Dict]:
-    """Retrieve average scores sorted by location using a pre-written
-    database query"""
+    """Retrieve average scores sorted by location from the location
+    analytics"""
 
-    average_scores = []
-    cursor = database_connection.cursor(dictionary=True)
-    # Excluding 25th Anniversary Show at Chicago Theatre from calculations
-    # due to non-standard number of panelist scores and score totals
-    query = ("SELECT l.locationid, l.venue, l.city, l.state, "
-             "AVG(pm.panelistscore) AS average_score, "
-             "SUM(pm.panelistscore) / (COUNT(s.showid) / 3) AS average_total, "
-             "COUNT(s.showid) / 3 AS show_count "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "join ww_showlocationmap lm ON lm.showid = pm.showid "
-             "JOIN ww_locations l ON l.locationid = lm.locationid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND l.locationid <> 3 " # Ignore any TBD locations
-             "AND s.showdate <> '2018-10-27' "
-             "GROUP BY l.locationid "
-             "ORDER BY average_score DESC, average_total DESC, "
-             "show_count DESC, l.venue ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
+    # The 25th Anniversary Show at Chicago Theatre is excluded from the
+    # analytics due to non-standard number of panelist scores and score
+    # totals
+    analytics = retrieve_location_analytics(database_connection)
+    location_stats = analytics.grouping("location")
+
+    if not location_stats:
         return None
 
-    for row in result:
-        location = OrderedDict()
-        location["id"] = row["locationid"]
-        location["venue"] = row["venue"]
-        location["city"] = row["city"]
-        location["state"] = row["state"]
-        location["average_score"] = Decimal(row["average_score"]).normalize()
-        location["average_total"] = Decimal(row["average_total"]).normalize()
-        location["show_count"] = Decimal(row["show_count"]).normalize()
+    average_scores = []
+    for location_id, info in location_stats.items():
+        if info["average_score"] is None:
+            continue
+
+        show_count = info["appearances"] / 3
+        location = OrderedDict(analytics.locations[location_id])
+        location["average_score"] = _decimal(info["average_score"])
+        location["average_total"] = _decimal(info["total_score"] / show_count)
+        location["show_count"] = _decimal(show_count)
         average_scores.append(location)
 
+    average_scores.sort(key=lambda location: location["venue"] or "")
+    average_scores.sort(key=lambda location: (location["average_score"],
+                                              location["average_total"],
+                                              location["show_count"]),
+                        reverse=True)
     return average_scores
 
+def retrieve_average_scores_by_state(database_connection: mysql.connector.connect
+                                    ) -> List[Dict]:
+    """Retrieve panelist score statistics rolled up by state, sorted
+    by average score"""
+
+    analytics = retrieve_location_analytics(database_connection)
+    state_stats = analytics.grouping("state")
+
+    if not state_stats:
+        return None
+
+    location_counts = Counter(location["state"] or ""
+                              for location in analytics.locations.values())
+    states = []
+    for state, info in state_stats.items():
+        if info["average_score"] is None:
+            continue
+
+        state_info = OrderedDict()
+        state_info["state"] = state or None
+        state_info["location_count"] = location_counts[state]
+        state_info.update(_location_scores(info))
+        states.append(state_info)
+
+    states.sort(key=lambda state: state["state"] or "")
+    states.sort(key=lambda state: (state["average_score"],
+                                   state["average_total"]),
+                reverse=True)
+    return states
+
+def retrieve_location_scores_by_year(location_id: int,
+                                     database_connection: mysql.connector.connect
+                                    ) -> Dict:
+    """Retrieve location details along with overall and per-year
+    panelist score statistics for the requested location ID"""
+
+    analytics = retrieve_location_analytics(database_connection)
+    if location_id not in analytics.locations:
+        return None
+
+    info = analytics.grouping("location")[location_id]
+    if info["average_score"] is None:
+        return None
+
+    location = OrderedDict(analytics.locations[location_id])
+    location["scores"] = _location_scores(info)
+    location["years"] = OrderedDict()
+    for (year_location_id, year), year_info in analytics.grouping("location_year").items():
+        if year_location_id == location_id and year_info["average_score"] is not None:
+            location["years"][year] = _location_scores(year_info)
+
+    return location
+
 #endregion
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Rendered page cache used by the Reports Site"""
+
+from datetime import date
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+from reports import compression
+from reports.cache import VersionedLRUCache
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_AGE = 86400
+
+#region Page Cache Classes
+class PageCacheEntry:
+    """Rendered page body, compressed once into each requested content
+    encoding, along with the data version and date it was rendered
+    from"""
+
+    def __init__(self, body: bytes, mimetype: str, version: str,
+                 encodings: Iterable[str] = compression.ENCODINGS):
+        self.variants = compression.compress_variants(body, encodings)
+        self.mimetype = mimetype
+        self.version = version
+        self.rendered_on = date.today()
+
+    @property
+    def body(self) -> bytes:
+        """Uncompressed page body"""
+        return self.variants[compression.IDENTITY]
+
+    def encoded_body(self, encoding: str) -> bytes:
+        """Return the page body in the requested content encoding,
+        falling back to the uncompressed body"""
+        return self.variants.get(encoding, self.body)
+
+class PageCache(VersionedLRUCache):
+    """Least recently used cache of rendered pages keyed by route and
+    query arguments. Entries rendered from an older data version, on an
+    earlier date or older than the maximum age are treated as missing,
+    so pages that depend on the current date are rendered again once
+    the date changes"""
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age: int = DEFAULT_MAX_AGE,
+                 enabled: bool = True):
+        super().__init__(max_entries=max_entries, max_age=max_age)
+        self.enabled = enabled
+
+    @staticmethod
+    def make_key(path: str, args,
+                 query_args: Optional[Dict[str, Tuple[str, ...]]] = None) -> Tuple:
+        """Build a cache key from the request path and the query
+        arguments read by the view. query_args maps each argument name
+        to the values the view recognizes; other values, and any other
+        arguments, render the default page and are left out of the key
+        so they cannot fill the cache with copies of the same page"""
+        if not query_args:
+            return (path, ())
+
+        values = []
+        for name, recognized in query_args.items():
+            value = args.get(name)
+            value = value.lower() if value else None
+            values.append((name, value if value in recognized else None))
+
+        return (path, tuple(values))
+
+    def get(self, key: Hashable, version: str,
+            default: Optional[PageCacheEntry] = None) -> Optional[PageCacheEntry]:
+        """Return the cached entry for the key if it was rendered from
+        the current data version today and has not expired"""
+        return super().get(key, (version, date.today()), default)
+
+    def set(self, key: Hashable, version: str, body: bytes,
+            mimetype: str) -> PageCacheEntry:
+        """Store a rendered page in the cache"""
+        entry = PageCacheEntry(body, mimetype, version)
+        return super().set(key, (version, entry.rendered_on), entry)
+
+#endregion
@@ -8,29 +8,21 @@ from typing import List, Dict
 import mysql.connector
 import numpy
 
+from reports import grouped_stats, snapshot
+
 #region Retrieval Functions
 def retrieve_all_scores(database_connection: mysql.connector.connect
                        ) -> List[int]:
     """Retrieve a list of all panelist scores from non-Best Of and
     non-Repeat shows"""
 
-    cursor = database_connection.cursor()
-    query = ("SELECT pm.panelistscore FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND pm.panelistscore IS NOT NULL "
-             "ORDER BY pm.panelistscore ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    scores = show_snapshot.scores(show_snapshot.regular & show_snapshot.has_score)
 
-    scores = []
-    for row in result:
-        scores.append(row[0])
+    if not scores:
+        return None
 
+    scores.sort()
     return scores
 
 def retrieve_score_spread(database_connection: mysql.connector.connect
@@ -38,26 +30,19 @@ def retrieve_score_spread(database_connection: mysql.connector.connect
     """Retrieve a list of grouped panelist scores from non-Best Of and
     non-Repeat shows"""
 
-    cursor = database_connection.cursor()
-    query = ("SELECT pm.panelistscore, COUNT(pm.panelistscore) "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "WHERE pm.panelistscore IS NOT NULL "
-             "AND s.bestof = 0 AND s.repeatshowid IS NULL "
-             "GROUP BY pm.panelistscore "
-             "ORDER BY pm.panelistscore ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    mask = show_snapshot.regular & show_snapshot.has_score
+
+    if not mask.any():
         return None
 
+    values, counts = numpy.unique(show_snapshot.score[mask], return_counts=True)
+
     scores = []
-    for row in result:
+    for value, count in zip(values, counts):
         score = OrderedDict()
-        score["score"] = row[0]
-        score["count"] = row[1]
+        score["score"] = int(value)
+        score["count"] = int(count)
         scores.append(score)
 
     return scores
@@ -68,14 +53,20 @@ def retrieve_score_spread(database_connection: mysql.connector.connect
 def calculate_stats(scores: List[int]) -> Dict:
     """Calculate stats for all of the panelist scores"""
 
+    all_stats = grouped_stats.grouped_statistics(scores)
+    if not all_stats:
+        return None
+
+    formatted = grouped_stats.format_statistics(all_stats[0])
     stats = OrderedDict()
-    stats["count"] = len(scores)
-    stats["minimum"] = int(numpy.amin(scores))
-    stats["maximum"] = int(numpy.amax(scores))
-    stats["mean"] = round(numpy.mean(scores), 4)
-    stats["median"] = int(numpy.median(scores))
-    stats["standard_deviation"] = round(numpy.std(scores), 4)
-    stats["sum"] = int(numpy.sum(scores))
+    stats["count"] = formatted["count"]
+    stats["minimum"] = formatted["minimum"]
+    stats["maximum"] = formatted["maximum"]
+    stats["mean"] = formatted["mean"]
+    stats["median"] = formatted["median"]
+    stats["standard_deviation"] = formatted["standard_deviation"]
+    stats["sum"] = formatted["total"]
+    stats["percentiles"] = formatted["percentiles"]
 
     return stats
 
@@ -4,137 +4,93 @@
 """WWDTM Panelist Appearances Report Functions"""
 
 from collections import OrderedDict
-from typing import Dict, List
+from datetime import date
+from typing import Dict
 import mysql.connector
-
-#region Retrieval Functions
-def retrieve_all_panelists(database_connection: mysql.connector.connect
-                          ) -> List[Dict]:
-    """Retrieves a dictionary for all available panelists from the
-    database"""
-
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT p.panelistid, p.panelist, p.panelistslug "
-             "FROM ww_panelists p "
-             "WHERE p.panelist <> '<Multiple>' "
-             "ORDER BY p.panelistslug ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    panelists = []
-    for row in result:
-        panelist = OrderedDict()
-        panelist["name"] = row["panelist"]
-        panelist["slug"] = row["panelistslug"]
-        panelists.append(panelist)
-
-    return panelists
+import numpy
+
+from reports import snapshot
+
+#region Appearance Gap Functions
+def calculate_appearance_gaps(dates: numpy.ndarray,
+                              as_of: date = None) -> Dict:
+    """Calculate the number of days since the last appearance and the
+    longest gap, in days, between consecutive appearances from a sorted
+    array of appearance dates"""
+
+    gaps = OrderedDict()
+    gaps["days_since"] = None
+    gaps["longest_gap"] = None
+    if not len(dates):
+        return gaps
+
+    as_of = numpy.datetime64(as_of or date.today(), "D")
+    gaps["days_since"] = max(int((as_of - dates[-1]).astype(numpy.int64)), 0)
+    if len(dates) > 1:
+        gaps["longest_gap"] = int(numpy.diff(dates).astype(numpy.int64).max())
+
+    return gaps
+
+def _appearance_info(name: str, slug: str) -> Dict:
+    """Return an empty first and most recent appearance entry"""
+
+    info = OrderedDict()
+    info["name"] = name
+    info["slug"] = slug
+    info["first"] = None
+    info["most_recent"] = None
+    info["count"] = 0
+    info["first_all"] = None
+    info["most_recent_all"] = None
+    info["count_all"] = 0
+    info["days_since"] = None
+    info["longest_gap"] = None
+    return info
 
 #endregion
 
 #region Report Functions
 def retrieve_first_most_recent_appearances(database_connection: mysql.connector.connect
-                                          ) -> List[Dict]:
+                                          ) -> Dict:
     """Retrieve first and most recent appearances for both regular
-    and all shows for all panelists"""
-    panelists = retrieve_all_panelists(database_connection)
+    and all shows for all panelists, along with the number of days
+    since each panelist's last regular show appearance and their longest
+    gap between regular show appearances, calculated from the in-memory
+    show snapshot"""
 
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    panelists = show_snapshot.panelists_by_slug()
     if not panelists:
         return None
 
-    panelist_appearances = OrderedDict()
-    for panelist in panelists:
-        info = OrderedDict()
-        info["name"] = panelist["name"]
-        info["slug"] = panelist["slug"]
-        info["first"] = None
-        info["most_recent"] = None
-        info["count"] = 0
-        info["first_all"] = None
-        info["most_recent_all"] = None
-        info["count_all"] = 0
-        panelist_appearances[panelist["slug"]] = info
-
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT p.panelist, p.panelistslug, "
-             "MIN(s.showdate) AS min, MAX(s.showdate) AS max "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 "
-             "AND s.repeatshowid IS null "
-             "AND p.panelist <> '<Multiple>' "
-             "GROUP BY p.panelistid "
-             "ORDER BY p.panelist ASC")
-    cursor.execute(query)
-    result = cursor.fetchall()
-
-    if not result:
-        return None
-
-    for row in result:
-        slug = row["panelistslug"]
-        panelist_appearances[slug]["first"] = row["min"].isoformat()
-        panelist_appearances[slug]["most_recent"] = row["max"].isoformat()
-
-    query = ("SELECT p.panelist, p.panelistslug, COUNT(pm.panelistid) AS count "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND p.panelist <> '<Multiple>' "
-             "GROUP BY p.panelistid "
-             "ORDER BY p.panelist ASC")
-    cursor.execute(query)
-    result = cursor.fetchall()
-
-    if not result:
-        return None
+    regular = show_snapshot.regular
+    panelist_pos = show_snapshot.panelist_pos
 
-    for row in result:
-        slug = row["panelistslug"]
-        panelist_appearances[slug]["count"] = row["count"]
-
-    query = ("SELECT p.panelist, p.panelistslug, COUNT(pm.panelistid) AS count "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE p.panelist <> '<Multiple>' "
-             "GROUP BY p.panelistid "
-             "ORDER BY p.panelist ASC")
-    cursor.execute(query)
-    result = cursor.fetchall()
-
-    if not result:
-        return None
+    # Appearance rows are in show date order, so a stable sort by
+    # panelist keeps each panelist's dates sorted
+    order = numpy.argsort(panelist_pos, kind="stable")
+    boundaries = numpy.searchsorted(panelist_pos[order],
+                                    numpy.arange(len(show_snapshot.panelists_id) + 1))
 
-    for row in result:
-        slug = row["panelistslug"]
-        panelist_appearances[slug]["count_all"] = row["count"]
-
-    query = ("SELECT p.panelist, p.panelistslug, "
-             "MIN(s.showdate) AS min, MAX(s.showdate) AS max "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE p.panelist <> '<Multiple>' "
-             "GROUP BY p.panelistid "
-             "ORDER BY p.panelist ASC")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return panelist_appearances
-
-    for row in result:
-        slug = row["panelistslug"]
-        panelist_appearances[slug]["first_all"] = row["min"].isoformat()
-        panelist_appearances[slug]["most_recent_all"] = row["max"].isoformat()
+    panelist_appearances = OrderedDict()
+    for slug, index in panelists:
+        info = _appearance_info(show_snapshot.panelists_name[index], slug)
+        rows = order[boundaries[index]:boundaries[index + 1]]
+        all_dates = show_snapshot.show_date[rows]
+        regular_dates = all_dates[regular[rows]]
+
+        if len(regular_dates):
+            info["first"] = str(regular_dates[0])
+            info["most_recent"] = str(regular_dates[-1])
+            info["count"] = len(regular_dates)
+
+        if len(all_dates):
+            info["first_all"] = str(all_dates[0])
+            info["most_recent_all"] = str(all_dates[-1])
+            info["count_all"] = len(all_dates)
+
+        info.update(calculate_appearance_gaps(regular_dates))
+        panelist_appearances[slug] = info
 
     return panelist_appearances
 
@@ -6,6 +6,7 @@
 from collections import OrderedDict
 from typing import List, Dict
 import mysql.connector
+import numpy
 
 #region Retrieval Functions
 def retrieve_panelist_appearance_counts(panelist_id: int,
@@ -38,18 +39,28 @@ def retrieve_panelist_appearance_counts(panelist_id: int,
     appearances["total"] = total_appearances
     return appearances
 
-def retrieve_all_appearance_counts(database_connection: mysql.connector.connect
-                                  ) -> List[Dict]:
-    """Retrieve all appearance counts for all panelists from the
-    database"""
+def retrieve_appearance_count_matrix(database_connection: mysql.connector.connect
+                                    ) -> Dict:
+    """Retrieve appearance counts for all panelists as a dense panelist
+    by year count matrix using a single grouped query. The year axis is
+    the list of years returned by retrieve_all_years and each panelist
+    includes a row of counts aligned with it along with a total"""
+
+    years = retrieve_all_years(database_connection)
+    if not years:
+        return None
 
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT DISTINCT p.panelistid, p.panelist, p.panelistslug "
+    query = ("SELECT p.panelistid, p.panelist, p.panelistslug, "
+             "YEAR(s.showdate) AS year, COUNT(pm.showid) AS count "
              "FROM ww_showpnlmap pm "
              "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
              "JOIN ww_shows s ON s.showid = pm.showid "
              "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "ORDER BY p.panelist ASC")
+             "GROUP BY p.panelistid, p.panelist, p.panelistslug, "
+             "YEAR(s.showdate) "
+             "ORDER BY p.panelist ASC, p.panelistid ASC, "
+             "YEAR(s.showdate) ASC;")
     cursor.execute(query)
     result = cursor.fetchall()
     cursor.close()
@@ -57,14 +68,63 @@ def retrieve_all_appearance_counts(database_connection: mysql.connector.connect
     if not result:
         return None
 
-    panelists = []
+    year_index = {year: index for index, year in enumerate(years)}
+    panelist_index = OrderedDict()
+    row_index = {}
+    panelist_rows = []
+    year_columns = []
+    counts = []
     for row in result:
+        if row["panelistid"] not in panelist_index:
+            panelist = OrderedDict()
+            panelist["id"] = row["panelistid"]
+            panelist["name"] = row["panelist"]
+            panelist["slug"] = row["panelistslug"]
+            row_index[row["panelistid"]] = len(panelist_index)
+            panelist_index[row["panelistid"]] = panelist
+
+        panelist_rows.append(row_index[row["panelistid"]])
+        year_columns.append(year_index[row["year"]])
+        counts.append(row["count"])
+
+    matrix = numpy.zeros((len(panelist_index), len(years)), dtype=numpy.int64)
+    matrix[panelist_rows, year_columns] = counts
+    totals = matrix.sum(axis=1)
+
+    panelists = []
+    for index, panelist in enumerate(panelist_index.values()):
+        panelist["appearances"] = matrix[index].tolist()
+        panelist["total"] = int(totals[index])
+        panelists.append(panelist)
+
+    appearance_matrix = OrderedDict()
+    appearance_matrix["years"] = years
+    appearance_matrix["panelists"] = panelists
+    appearance_matrix["counts"] = matrix
+    appearance_matrix["totals"] = totals
+    return appearance_matrix
+
+def retrieve_all_appearance_counts(database_connection: mysql.connector.connect
+                                  ) -> List[Dict]:
+    """Retrieve all appearance counts for all panelists from the
+    database"""
+
+    appearance_matrix = retrieve_appearance_count_matrix(database_connection)
+    if not appearance_matrix:
+        return None
+
+    years = appearance_matrix["years"]
+    panelists = []
+    for row in appearance_matrix["panelists"]:
         panelist = {}
-        panelist_id = row["panelistid"]
-        panelist["name"] = row["panelist"]
-        panelist["slug"] = row["panelistslug"]
-        appearances = retrieve_panelist_appearance_counts(panelist_id=panelist_id,
-                                                          database_connection=database_connection)
+        panelist["name"] = row["name"]
+        panelist["slug"] = row["slug"]
+        appearances = OrderedDict()
+        for year, count in zip(years, row["appearances"]):
+            if count:
+                appearances[year] = count
+
+        appearances["total"] = row["total"]
         panelist["appearances"] = appearances
         panelists.append(panelist)
 
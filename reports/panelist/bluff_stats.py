@@ -35,6 +35,86 @@ def retrieve_all_panelists(database_connection: mysql.connector.connect
 
     return panelists
 
+def _retrieve_bluff_counts(database_connection: mysql.connector.connect,
+                           panelist_id: int = None
+                          ) -> List[Dict]:
+    """Retrieves Bluff the Listener counts for all panelists, or for the
+    requested panelist ID, using a single grouped query. Each show is
+    only classified as a regular or unique Best Of Bluff the Listener
+    show once before it is joined to the panelist map"""
+
+    panelist_filter = ""
+    parameters = ()
+    if panelist_id is not None:
+        panelist_filter = "AND p.panelistid = %s "
+        parameters = (panelist_id, )
+
+    # Chosen and correct counts only include shows that are not repeats
+    # and are either regular shows or Best Of shows with a unique Bluff
+    # the Listener segment
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT p.panelistid, p.panelist, p.panelistslug, "
+             "COALESCE(ch.chosen, 0) AS chosen, "
+             "COALESCE(co.correct, 0) AS correct, "
+             "COALESCE(ap.appearances, 0) AS appearances, "
+             "COALESCE(ap.unique_best_of, 0) AS unique_best_of "
+             "FROM ww_panelists p "
+             "LEFT JOIN ( "
+             "SELECT blm.chosenbluffpnlid AS panelistid, "
+             "COUNT(blm.showid) AS chosen "
+             "FROM ww_showbluffmap blm "
+             "JOIN ww_shows s ON s.showid = blm.showid "
+             "WHERE s.repeatshowid IS NULL "
+             "AND (s.bestof = 0 OR (s.bestof = 1 AND s.bestofuniquebluff = 1)) "
+             "GROUP BY blm.chosenbluffpnlid "
+             ") ch ON ch.panelistid = p.panelistid "
+             "LEFT JOIN ( "
+             "SELECT blm.correctbluffpnlid AS panelistid, "
+             "COUNT(blm.showid) AS correct "
+             "FROM ww_showbluffmap blm "
+             "JOIN ww_shows s ON s.showid = blm.showid "
+             "WHERE s.repeatshowid IS NULL "
+             "AND (s.bestof = 0 OR (s.bestof = 1 AND s.bestofuniquebluff = 1)) "
+             "GROUP BY blm.correctbluffpnlid "
+             ") co ON co.panelistid = p.panelistid "
+             "LEFT JOIN ( "
+             "SELECT pm.panelistid, "
+             "SUM(bs.regular) AS appearances, "
+             "SUM(bs.unique_best_of) AS unique_best_of "
+             "FROM ww_showpnlmap pm "
+             "JOIN ( "
+             "SELECT s.showid, "
+             "SUM(s.bestof = 0 AND sd.showdescription LIKE '%bluff%') AS regular, "
+             "SUM(s.bestof = 1 AND s.bestofuniquebluff = 1) AS unique_best_of "
+             "FROM ww_shows s "
+             "JOIN ww_showdescriptions sd ON sd.showid = s.showid "
+             "JOIN ww_showbluffmap blm ON blm.showid = s.showid "
+             "WHERE s.repeatshowid IS NULL "
+             "AND blm.chosenbluffpnlid IS NOT NULL "
+             "AND blm.correctbluffpnlid IS NOT NULL "
+             "GROUP BY s.showid "
+             ") bs ON bs.showid = pm.showid "
+             "GROUP BY pm.panelistid "
+             ") ap ON ap.panelistid = p.panelistid "
+             "WHERE p.panelist <> '<Multiple>' "
+             "{}"
+             "ORDER BY p.panelistslug ASC;").format(panelist_filter)
+    cursor.execute(query, parameters)
+    result = cursor.fetchall()
+    cursor.close()
+
+    return result
+
+def _bluff_counts(row: Dict) -> Dict:
+    """Build a dictionary of Bluff the Listener counts from a row"""
+
+    counts = OrderedDict()
+    counts["chosen"] = int(row["chosen"])
+    counts["correct"] = int(row["correct"])
+    counts["appearances"] = int(row["appearances"])
+    counts["unique_best_of"] = int(row["unique_best_of"])
+    return counts
+
 def retrieve_panelist_bluff_counts(panelist_id: int,
                                    database_connection: mysql.connector.connect
                                   ) -> Dict:
@@ -42,92 +122,36 @@ def retrieve_panelist_bluff_counts(panelist_id: int,
     times a panelist's Bluff story was chosen and the number of times
     a panelist had the correct story"""
 
-    counts = OrderedDict()
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT ( "
-             "SELECT COUNT(blm.showid) FROM ww_showbluffmap blm "
-             "JOIN ww_panelists p ON p.panelistid = blm.chosenbluffpnlid "
-             "JOIN ww_shows s ON s.showid = blm.showid "
-             "WHERE blm.chosenbluffpnlid = %s "
-             "AND s.repeatshowid IS NULL "
-             "AND (s.bestof = 0 OR (s.bestof = 1 AND s.bestofuniquebluff = 1)) "
-             ") AS chosen, ( "
-             "SELECT COUNT(blm.showid) FROM ww_showbluffmap blm "
-             "JOIN ww_panelists p ON p.panelistid = blm.correctbluffpnlid "
-             "JOIN ww_shows s ON s.showid = blm.showid "
-             "WHERE blm.correctbluffpnlid = %s "
-             "AND s.repeatshowid IS NULL "
-             "AND (s.bestof = 0 OR (s.bestof = 1 AND s.bestofuniquebluff = 1)) "
-             ") AS correct;")
-    cursor.execute(query, (panelist_id, panelist_id, ))
-    result = cursor.fetchone()
+    result = _retrieve_bluff_counts(database_connection, panelist_id)
 
     if not result:
+        counts = OrderedDict()
         counts["chosen"] = 0
         counts["correct"] = 0
-    else:
-        counts["chosen"] = result["chosen"]
-        counts["correct"] = result["correct"]
-
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT COUNT(s.showdate) as appearances "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_showdescriptions sd ON sd.showid = pm.showid "
-             "JOIN ww_showbluffmap blm ON blm.showid = pm.showid "
-             "WHERE pm.panelistid = %s "
-             "AND sd.showdescription LIKE '%bluff%' "
-             "AND s.repeatshowid IS NULL AND s.bestof = 0 "
-             "AND (blm.chosenbluffpnlid IS NOT NULL "
-             "AND blm.correctbluffpnlid IS NOT NULL) "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_id, ))
-    result = cursor.fetchone()
-    cursor.close()
-
-    if not result:
         counts["appearances"] = None
-    else:
-        counts["appearances"] = result["appearances"]
-
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT COUNT(s.showdate) as appearances "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_showdescriptions sd ON sd.showid = pm.showid "
-             "JOIN ww_showbluffmap blm ON blm.showid = pm.showid "
-             "WHERE pm.panelistid = %s "
-             "AND s.repeatshowid IS NULL "
-             "AND s.bestof = 1 AND s.bestofuniquebluff = 1 "
-             "AND (blm.chosenbluffpnlid IS NOT NULL "
-             "AND blm.correctbluffpnlid IS NOT NULL) "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_id, ))
-    result = cursor.fetchone()
-    cursor.close()
-
-    if not result:
         counts["unique_best_of"] = None
-    else:
-        counts["unique_best_of"] = result["appearances"]
+        return counts
 
-    return counts
+    return _bluff_counts(result[0])
 
 def retrieve_all_panelist_bluff_stats(database_connection: mysql.connector.connect
                                      ) -> List[Dict]:
     """Retrieves a list of Bluff the Listener statistics for all
     panelists"""
 
-    panelists = retrieve_all_panelists(database_connection)
+    result = _retrieve_bluff_counts(database_connection)
 
-    if not panelists:
+    if not result:
         return None
 
     stats = []
-    for panelist in panelists:
-        counts = retrieve_panelist_bluff_counts(panelist["id"],
-                                                database_connection)
-        if counts  and (counts["correct"] or counts["chosen"]):
+    for row in result:
+        counts = _bluff_counts(row)
+        if counts["correct"] or counts["chosen"]:
+            panelist = OrderedDict()
+            panelist["id"] = row["panelistid"]
+            panelist["slug"] = row["panelistslug"]
+            panelist["name"] = row["panelist"]
             panelist.update(counts)
             stats.append(panelist)
 
@@ -7,8 +7,6 @@ from collections import OrderedDict
 from typing import Dict, List
 import mysql.connector
 
-from reports.panelist import stats_summary
-
 #region Retrieval Functions
 def retrieve_show_years(database_connection: mysql.connector.connect
                        ) -> List[int]:
@@ -31,74 +29,109 @@ def retrieve_show_years(database_connection: mysql.connector.connect
 
     return years
 
-def retrieve_show_info(show_date: str,
-                       database_connection: mysql.connector.connect
-                      ) -> Dict:
-    """Retrieve show host, scorekeeper and Not My Job guest for the
-    requested show ID"""
+def retrieve_show_info_by_dates(show_dates: List[str],
+                                database_connection: mysql.connector.connect
+                               ) -> Dict[str, Dict]:
+    """Retrieve show host, scorekeeper and Best Of flag for all of the
+    requested show dates using a single query. Returns a dictionary
+    keyed by ISO formatted show date"""
+
+    shows_info = {}
+    show_dates = list(dict.fromkeys(show_dates))
+    if not show_dates:
+        return shows_info
 
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.bestof, h.host, sk.scorekeeper "
+    query = ("SELECT s.showid, s.showdate, s.bestof, h.host, sk.scorekeeper "
              "FROM ww_showhostmap hm "
              "JOIN ww_hosts h ON h.hostid = hm.hostid "
              "JOIN ww_shows s ON s.showid = hm.showid "
              "JOIN ww_showskmap skm ON skm.showid = hm.showid "
              "JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid "
-             "WHERE s.showdate = %s;")
-    cursor.execute(query, (show_date, ))
-    result = cursor.fetchone()
+             "WHERE s.showdate IN ({});".format(", ".join(["%s"] * len(show_dates))))
+    cursor.execute(query, tuple(show_dates))
+    result = cursor.fetchall()
     cursor.close()
 
-    if not result:
+    for row in result:
+        show_date = row["showdate"].isoformat()
+        if show_date in shows_info:
+            continue
+
+        show_info = OrderedDict()
+        show_info["id"] = row["showid"]
+        show_info["best_of"] = bool(row["bestof"])
+        show_info["host"] = row["host"]
+        show_info["scorekeeper"] = row["scorekeeper"]
+        shows_info[show_date] = show_info
+
+    return shows_info
+
+def retrieve_show_info(show_date: str,
+                       database_connection: mysql.connector.connect
+                      ) -> Dict:
+    """Retrieve show host, scorekeeper and Not My Job guest for the
+    requested show ID"""
+
+    shows_info = retrieve_show_info_by_dates([show_date], database_connection)
+    if not shows_info:
         return None
 
-    show_info = OrderedDict()
-    show_info["id"] = result["showid"]
-    show_info["best_of"] = bool(result["bestof"])
-    show_info["host"] = result["host"]
-    show_info["scorekeeper"] = result["scorekeeper"]
+    return next(iter(shows_info.values()))
 
-    return show_info
+def retrieve_show_guests_by_show_ids(show_ids: List[int],
+                                     database_connection: mysql.connector.connect
+                                    ) -> Dict[int, List[str]]:
+    """Retrieves lists of Not My Job guest(s) for all of the requested
+    show IDs using a single query. Returns a dictionary keyed by show
+    ID"""
 
-def retrieve_show_guests(show_id: int,
-                         database_connection: mysql.connector.connect
-                        ) -> List[str]:
-    """Retrieves a list of Not My Job guest(s) for the requested
-    show ID"""
+    show_guests = {}
+    show_ids = list(dict.fromkeys(show_ids))
+    if not show_ids:
+        return show_guests
 
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT g.guest "
+    query = ("SELECT gm.showid, g.guest "
              "FROM ww_showguestmap gm "
              "JOIN ww_guests g ON g.guestid = gm.guestid "
-             "WHERE gm.showid = %s "
+             "WHERE gm.showid IN ({}) "
              "AND g.guestid <> 76 "
-             "ORDER BY gm.showguestmapid ASC;")
-    cursor.execute(query, (show_id, ))
+             "ORDER BY gm.showguestmapid ASC;".format(", ".join(["%s"] * len(show_ids))))
+    cursor.execute(query, tuple(show_ids))
     result = cursor.fetchall()
     cursor.close()
 
-    if not result:
-        return None
-
-    guests = []
     for row in result:
-        guests.append(row["guest"])
+        show_guests.setdefault(row["showid"], []).append(row["guest"])
 
-    return guests
+    return show_guests
+
+def retrieve_show_guests(show_id: int,
+                         database_connection: mysql.connector.connect
+                        ) -> List[str]:
+    """Retrieves a list of Not My Job guest(s) for the requested
+    show ID"""
+
+    show_guests = retrieve_show_guests_by_show_ids([show_id], database_connection)
+    return show_guests.get(show_id)
 
 def retrieve_panelists_first_shows(database_connection: mysql.connector.connect
                                   ) -> Dict:
     """Returns an OrderedDict containing all panelists and their
-    respective first shows"""
+    respective first shows. Show details, guests and regular show
+    appearance counts are retrieved for all debut shows at once"""
 
     cursor = database_connection.cursor(dictionary=True)
     query = ("SELECT p.panelistid, p.panelist, p.panelistslug, "
-             "MIN(s.showdate) AS first, YEAR(MIN(s.showdate)) AS year "
+             "MIN(s.showdate) AS first, YEAR(MIN(s.showdate)) AS year, "
+             "COUNT(CASE WHEN s.bestof = 0 AND s.repeatshowid IS NULL "
+             " THEN pm.showid END) AS regular "
              "FROM ww_showpnlmap pm "
              "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
              "JOIN ww_shows s ON s.showid = pm.showid "
              "WHERE p.panelist <> '<Multiple>' "
-             "GROUP BY p.panelist "
+             "GROUP BY p.panelistid, p.panelist, p.panelistslug "
              "ORDER BY MIN(s.showdate) ASC;")
     cursor.execute(query, )
     result = cursor.fetchall()
@@ -107,29 +140,31 @@ def retrieve_panelists_first_shows(database_connection: mysql.connector.connect
     if not result:
         return None
 
+    shows_info = retrieve_show_info_by_dates([row["first"].isoformat() for row in result],
+                                             database_connection)
+    show_guests = retrieve_show_guests_by_show_ids(
+        [info["id"] for info in shows_info.values()],
+        database_connection
+    )
+
     panelists = OrderedDict()
     for row in result:
         info = OrderedDict()
-        show_date = row["first"]
-        show_info = retrieve_show_info(show_date,
-                                       database_connection)
-        show_id = show_info["id"]
+        show_date = row["first"].isoformat()
+        show_info = shows_info.get(show_date, {})
+        show_id = show_info.get("id")
 
         info["id"] = row["panelistid"]
         info["panelist_name"] = row["panelist"]
         info["panelist_slug"] = row["panelistslug"]
-        info["show"] = row["first"].isoformat()
+        info["show"] = show_date
         info["show_id"] = show_id
         info["year"] = row["year"]
-        info["best_of"] = show_info["best_of"]
-        appearance_info = stats_summary.retrieve_appearances_by_panelist(info["panelist_slug"],
-                                                                         database_connection)
-        info["regular_appearances"] = appearance_info["regular"]
-        info["host"] = show_info["host"]
-        info["scorekeeper"] = show_info["scorekeeper"]
-
-        info["guests"] = retrieve_show_guests(show_id,
-                                              database_connection)
+        info["best_of"] = show_info.get("best_of")
+        info["regular_appearances"] = row["regular"]
+        info["host"] = show_info.get("host")
+        info["scorekeeper"] = show_info.get("scorekeeper")
+        info["guests"] = show_guests.get(show_id)
 
         panelists[info["panelist_slug"]] = info
 
@@ -147,12 +182,11 @@ def panelist_debuts_by_year(database_connection: mysql.connector.connect
     panelists = retrieve_panelists_first_shows(database_connection)
 
     years_debut = OrderedDict()
-    for year in show_years:
+    for year in show_years or []:
         years_debut[year] = []
 
-    for panelist in panelists:
-        panelist_info = panelists[panelist]
-        years_debut[panelist_info["year"]].append(panelist_info)
+    for panelist_info in (panelists or {}).values():
+        years_debut.setdefault(panelist_info["year"], []).append(panelist_info)
 
     return years_debut
 
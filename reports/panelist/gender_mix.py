@@ -4,61 +4,71 @@
 """WWDTM Panel Gender Mix Report Functions"""
 
 from collections import OrderedDict
-from typing import Dict, List, Text
+from typing import Dict, Optional, Text
 import mysql.connector
+import numpy
 
-#region Retrieval Functions
-def retrieve_show_years(database_connection: mysql.connector.connect
-                       ) -> List[int]:
-    """Retrieve a list of show years available in the database"""
+from reports import snapshot
 
-    years = []
-    cursor = database_connection.cursor()
-    query = ("SELECT DISTINCT YEAR(s.showdate) FROM ww_shows s "
-             "ORDER BY YEAR(s.showdate) ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
+# Excluding 25th anniversary special
+EXCLUDED_SHOW_DATES = numpy.array(["2018-10-27"], dtype="datetime64[D]")
 
-    if not result:
-        return None
+#region Retrieval Functions
+def retrieve_panel_gender_counts(gender: Text,
+                                 database_connection: mysql.connector.connect,
+                                 year: Optional[int] = None
+                                ) -> Dict[int, Dict]:
+    """Get a count of shows for every show year, or only the requested
+    year, that have zero, one, two or three panelists of a given gender,
+    calculated in a single pass over the show snapshot"""
 
-    for row in result:
-        years.append(row[0])
+    # panelistgender field only contains a single letter
+    gender_tag = gender[0].upper()
 
-    return years
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    show_count = len(show_snapshot.shows_id)
+    mask = (show_snapshot.regular
+            & ~numpy.isin(show_snapshot.show_date, EXCLUDED_SHOW_DATES))
+    if year is not None:
+        mask &= show_snapshot.year == year
+
+    # Number of panelists of the requested gender on each show, only
+    # counting shows that have at least one panelist
+    has_panel = numpy.bincount(show_snapshot.show_pos[mask],
+                               minlength=show_count) > 0
+    gender_counts = numpy.bincount(
+        show_snapshot.show_pos[mask & (show_snapshot.gender == gender_tag)],
+        minlength=show_count
+    )
+
+    years, year_index = numpy.unique(show_snapshot.shows_year, return_inverse=True)
+    in_range = has_panel & (gender_counts < 4)
+    histogram = numpy.bincount(year_index[in_range] * 4 + gender_counts[in_range],
+                               minlength=len(years) * 4).reshape(len(years), 4)
+
+    all_counts = OrderedDict()
+    for show_year, year_histogram in zip(years.tolist(), histogram.tolist()):
+        if year is not None and show_year != year:
+            continue
+
+        counts = OrderedDict()
+        for gender_count in range(0, 4):
+            counts["{}{}".format(gender_count, gender_tag)] = year_histogram[gender_count]
+
+        counts["total"] = sum(year_histogram)
+        all_counts[show_year] = counts
+
+    return all_counts
 
 def retrieve_panel_gender_count_by_year(year: int,
                                         gender: Text,
                                         database_connection: mysql.connector.connect
-                                       ) -> int:
-    """Get a count of shows for the requested year that has the
-    requested number of panelists of a given gender"""
+                                       ) -> Optional[Dict]:
+    """Get a count of shows for the requested year that have zero, one,
+    two or three panelists of a given gender"""
 
-    # panelistgender field only contains a single letter
-    gender_tag = gender[0].upper()
-
-    counts = OrderedDict()
-    cursor = database_connection.cursor()
-
-    for gender_count in range(0, 4):
-        query = ("SELECT s.showdate FROM ww_showpnlmap pm "
-                 "JOIN ww_shows s ON s.showid = pm.showid "
-                 "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-                 "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-                 "AND p.panelistgender = %s "
-                 "AND year(s.showdate) = %s "
-                 "AND s.showdate <> '2018-10-27' " # Exclude 25th anniversary special
-                 "GROUP BY s.showdate "
-                 "HAVING COUNT(p.panelistgender) = %s;")
-        cursor.execute(query, (gender_tag, year, gender_count, ))
-        cursor.fetchall()
-        counts["{}{}".format(gender_count, gender_tag)] = cursor.rowcount
-
-    cursor.close()
-    total = sum(counts.values())
-    counts["total"] = total
-    return counts
+    counts = retrieve_panel_gender_counts(gender, database_connection, year=year)
+    return counts.get(year)
 
 #endregion
 
@@ -69,15 +79,6 @@ def panel_gender_mix_breakdown(gender: Text,
     """Calculate the panel gender breakdown for all show years and
     return an OrderedDict containing count for each year"""
 
-    show_years = retrieve_show_years(database_connection)
-
-    gender_mix_breakdown = OrderedDict()
-    for year in show_years:
-        count = retrieve_panel_gender_count_by_year(year=year,
-                                                    gender=gender,
-                                                    database_connection=database_connection)
-        gender_mix_breakdown[year] = count
-
-    return gender_mix_breakdown
+    return retrieve_panel_gender_counts(gender, database_connection)
 
 #endregion
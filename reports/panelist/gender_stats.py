@@ -8,6 +8,8 @@ from typing import Dict, List, Text
 import mysql.connector
 import numpy
 
+from reports import grouped_stats, snapshot
+
 def retrieve_show_years(database_connection: mysql.connector.connect
                        ) -> List[int]:
     """Retrieve a list of available show years"""
@@ -67,25 +69,22 @@ def retrieve_stats_by_year_gender(database_connection: mysql.connector.connect
     """Retrieve statistics about panelist scores broken out by year
     and gender"""
 
-    show_years = retrieve_show_years(database_connection)
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    show_years = numpy.unique(show_snapshot.shows_year).tolist()
+
+    scored = show_snapshot.regular & show_snapshot.has_score
+    score_stats = grouped_stats.grouped_statistics(show_snapshot.score[scored],
+                                                   show_snapshot.year[scored],
+                                                   show_snapshot.gender[scored])
 
     all_stats = OrderedDict()
     for year in show_years:
         all_stats[year] = OrderedDict()
         for gender in ["F", "M"]:
-            stats = OrderedDict()
-            scores = retrieve_scores_by_year_gender(year=year,
-                                                    gender=gender,
-                                                    database_connection=database_connection)
-            if scores:
-                stats["minimum"] = int(numpy.amin(scores))
-                stats["maximum"] = int(numpy.amax(scores))
-                stats["mean"] = round(numpy.mean(scores), 4)
-                stats["median"] = int(numpy.median(scores))
-                stats["standard_deviation"] = round(numpy.std(scores), 4)
-                stats["count"] = len(scores)
-                stats["total"] = int(numpy.sum(scores))
-                all_stats[year][gender] = stats
+            if (year, gender) in score_stats:
+                all_stats[year][gender] = grouped_stats.format_statistics(
+                    score_stats[(year, gender)]
+                )
             else:
                 all_stats[year][gender] = None
 
@@ -6,6 +6,7 @@
 from collections import OrderedDict
 from typing import List, Dict
 import mysql.connector
+import numpy
 
 #region Retrieval Functions
 def retrieve_panelists(database_connection: mysql.connector.connect
@@ -36,38 +37,6 @@ def retrieve_panelists(database_connection: mysql.connector.connect
     except mysql.connector.Error:
         return
 
-def retrieve_panelist_appearances(panelists: Dict,
-                                  database_connection: mysql.connector.connect
-                                 ) -> Dict:
-    """Retrieve panelist appearances from the Stats Page database"""
-
-    panelist_appearances = OrderedDict()
-    for _, panelist_info in panelists.items():
-        try:
-            appearances = []
-            cursor = database_connection.cursor()
-            query = ("SELECT s.showdate FROM ww_showpnlmap pm "
-                     "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-                     "JOIN ww_shows s ON s.showid = pm.showid "
-                     "WHERE p.panelistslug = %s "
-                     "AND pm.panelistscore IS NOT NULL "
-                     "AND s.bestof = 0 "
-                     "AND s.repeatshowid IS NULL "
-                     "ORDER BY s.showdate ASC;")
-            cursor.execute(query, (panelist_info["slug"],))
-            result = cursor.fetchall()
-            cursor.close()
-
-            if result:
-                for appearance in result:
-                    appearances.append(appearance[0].isoformat())
-
-                panelist_appearances[panelist_info["slug"]] = appearances
-        except mysql.connector.Error:
-            return
-
-    return panelist_appearances
-
 def retrieve_show_scores(database_connection: mysql.connector.connect) -> Dict:
     """Retrieve scores for each show and panelist from the Stats Page
     Database"""
@@ -104,42 +73,63 @@ def retrieve_show_scores(database_connection: mysql.connector.connect) -> Dict:
 #endregion
 
 #region Results Generation Functions
+def generate_score_matrix(panelists: Dict,
+                          show_scores: Dict) -> numpy.ndarray:
+    """Build a shows by panelists matrix of scores, with NaN for shows
+    that a panelist did not appear on. Columns follow the order of the
+    panelists dictionary"""
+
+    panelist_columns = {panelist["slug"]: column
+                        for column, (_, panelist) in enumerate(panelists.items())}
+    scores = numpy.full((len(show_scores), len(panelist_columns)), numpy.nan)
+    for row, (_, show) in enumerate(show_scores.items()):
+        for panelist_slug, score in show.items():
+            column = panelist_columns.get(panelist_slug)
+            if column is not None and score is not None:
+                scores[row, column] = score
+
+    return scores
+
+def generate_panelist_vs_panelist_matrix(scores: numpy.ndarray):
+    """Calculate the wins and draws matrices from a shows by panelists
+    score matrix. wins[a, b] is the number of shows where panelist a
+    scored higher than panelist b; losses are the transpose of wins"""
+
+    # Comparisons against NaN are always False, so shows where either
+    # panelist did not appear are not counted
+    with numpy.errstate(invalid="ignore"):
+        wins = (scores[:, :, numpy.newaxis] > scores[:, numpy.newaxis, :]).sum(axis=0)
+
+    # Every show two panelists appeared on together is a win, a loss or
+    # a draw, so draws are derived from wins and losses
+    appeared = (~numpy.isnan(scores)).astype(numpy.int64)
+    together = appeared.T @ appeared
+    draws = together - wins - wins.T
+
+    return wins, draws
+
 def generate_panelist_vs_panelist_results(panelists: Dict,
-                                          panelist_appearances: Dict,
-                                          show_scores: Dict
-                                          ) -> Dict:
-    """Generate panelist vs panelist results"""
+                                          show_scores: Dict) -> Dict:
+    """Generate panelist vs panelist results, deriving the shows each
+    pair of panelists have in common from the show scores"""
+
+    slugs = [panelist["slug"] for _, panelist in panelists.items()]
+    scores = generate_score_matrix(panelists, show_scores)
+    wins, draws = generate_panelist_vs_panelist_matrix(scores)
+    wins = wins.tolist()
+    draws = draws.tolist()
 
     pvp_results = OrderedDict()
-    for _, panelist_a in panelists.items():
-        panelist_a = panelist_a["slug"]
+    for index_a, panelist_a in enumerate(slugs):
         pvp_results[panelist_a] = OrderedDict()
-        for _, panelist_b in panelists.items():
-            panelist_b = panelist_b["slug"]
-            if panelist_a != panelist_b:
-                panelist_a_appearances = panelist_appearances[panelist_a]
-                panelist_b_appearances = panelist_appearances[panelist_b]
-                a_b_intersect = list(set(panelist_a_appearances) & set(panelist_b_appearances))
-                a_b_intersect.sort()
-
-                pvp_results[panelist_a][panelist_b] = OrderedDict()
-                wins = 0
-                draws = 0
-                losses = 0
-                for show in a_b_intersect:
-                    panelist_a_score = show_scores[show][panelist_a]
-                    panelist_b_score = show_scores[show][panelist_b]
-                    if panelist_a_score > panelist_b_score:
-                        wins = wins + 1
-                    elif panelist_a_score == panelist_b_score:
-                        draws = draws + 1
-                    else:
-                        losses = losses + 1
-
-                pvp_results[panelist_a][panelist_b]["wins"] = wins
-                pvp_results[panelist_a][panelist_b]["draws"] = draws
-                pvp_results[panelist_a][panelist_b]["losses"] = losses
-                pvp_results[panelist_a][panelist_b]["total"] = wins + draws + losses
+        for index_b, panelist_b in enumerate(slugs):
+            if index_a != index_b:
+                result = OrderedDict()
+                result["wins"] = wins[index_a][index_b]
+                result["draws"] = draws[index_a][index_b]
+                result["losses"] = wins[index_b][index_a]
+                result["total"] = result["wins"] + result["draws"] + result["losses"]
+                pvp_results[panelist_a][panelist_b] = result
 
     return pvp_results
 
@@ -7,78 +7,87 @@ from collections import OrderedDict
 from typing import Dict, List
 import mysql.connector
 
+from reports import data_version
+from reports.cache import VersionedLRUCache
+
+PAIR_CACHE_SIZE = 128
+pair_scores = VersionedLRUCache(max_entries=PAIR_CACHE_SIZE)
+_MISSING = object()
+
 #region Retrieval Functions
-def retrieve_common_shows(database_connection: mysql.connector.connect,
-                          panelist_slug_1: str,
-                          panelist_slug_2: str
-                         ) -> List[int]:
-    """Retrieve shows in which the two panelists have appeared
-    together on a panel, excluding Best Of, Repeats and the 20th
-    Anniversary special"""
+def retrieve_common_scores(database_connection: mysql.connector.connect,
+                           panelist_slug_a: str,
+                           panelist_slug_b: str
+                          ) -> Dict:
+    """Retrieves scores and ranks for the two requested panelists for
+    every show in which both panelists appeared together, using a
+    single query. Excludes Best Of, Repeats and the 20th Anniversary
+    special"""
 
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT pm.showid FROM ww_showpnlmap pm "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
+    query = ("SELECT s.showdate, p.panelist, p.panelistslug, "
+             "pm.panelistscore, pm.showpnlrank FROM ww_showpnlmap pm "
              "JOIN ww_shows s ON s.showid = pm.showid "
+             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
+             "JOIN ( "
+             "SELECT cpm.showid FROM ww_showpnlmap cpm "
+             "JOIN ww_panelists cp ON cp.panelistid = cpm.panelistid "
+             "JOIN ww_shows cs ON cs.showid = cpm.showid "
+             "WHERE cp.panelistslug IN (%s, %s) "
+             "AND cpm.panelistscore IS NOT NULL "
+             "AND cs.showdate <> '2018-10-27' "
+             "AND cs.bestof = 0 AND cs.repeatshowid IS NULL "
+             "GROUP BY cpm.showid "
+             "HAVING COUNT(cpm.showid) = 2 "
+             ") common ON common.showid = pm.showid "
              "WHERE p.panelistslug IN (%s, %s) "
-             "AND s.showdate <> '2018-10-27' "
-             "AND s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND pm.panelistscore IS NOT NULL "
-             "GROUP BY pm.showid "
-             "HAVING COUNT(pm.showid) = 2 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_slug_1, panelist_slug_2, ))
+             "ORDER BY s.showdate ASC, pm.showpnlmapid ASC;")
+    cursor.execute(query, (panelist_slug_a, panelist_slug_b,
+                           panelist_slug_a, panelist_slug_b, ))
     result = cursor.fetchall()
     cursor.close()
 
     if not result:
         return None
 
-    shows = []
-    for row in result:
-        shows.append(row["showid"])
-
-    return shows
+    return _build_show_scores(result)
 
-def retrieve_panelists_scores(database_connection: mysql.connector.connect,
-                              show_ids: List[int],
-                              panelist_slug_a: str,
-                              panelist_slug_b: str,
-                             ) -> Dict:
-    """Retrieves panelists scores for the two requested panelists"""
-
-    if not show_ids:
-        return None
+def _build_show_scores(result: List[Dict]) -> Dict:
+    """Group panelist score rows by show date"""
 
     show_scores = OrderedDict()
-    for show_id in show_ids:
-        cursor = database_connection.cursor(dictionary=True)
+    for row in result:
+        show_date = row["showdate"].isoformat()
+        if show_date not in show_scores:
+            show_scores[show_date] = OrderedDict()
 
-        query = ("SELECT s.showdate, p.panelist, p.panelistslug, "
-                 "pm.panelistscore, pm.showpnlrank FROM ww_showpnlmap pm "
-                 "JOIN ww_shows s ON s.showid = pm.showid "
-                 "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-                 "WHERE s.showid = %s "
-                 "AND p.panelistslug IN (%s, %s);")
-        cursor.execute(query, (show_id, panelist_slug_a, panelist_slug_b, ))
-        result = cursor.fetchall()
+        panelist_info = OrderedDict()
+        panelist_slug = row["panelistslug"]
+        panelist_info["slug"] = panelist_slug
+        panelist_info["name"] = row["panelist"]
+        panelist_info["score"] = row["panelistscore"]
+        panelist_info["rank"] = row["showpnlrank"]
+        show_scores[show_date][panelist_slug] = panelist_info
 
-        if not result:
-            return None
+    return show_scores
 
-        for row in result:
-            show_date = row["showdate"].isoformat()
-            if show_date not in show_scores:
-                show_scores[show_date] = OrderedDict()
+def retrieve_pair_scores(database_connection: mysql.connector.connect,
+                         panelist_slug_a: str,
+                         panelist_slug_b: str
+                        ) -> Dict:
+    """Returns scores for shows in which the two panelists appeared
+    together. Results are cached for each unordered pair of panelists
+    until the data version changes"""
 
-            panelist_info = OrderedDict()
-            panelist_slug = row["panelistslug"]
-            panelist_info["slug"] = panelist_slug
-            panelist_info["name"] = row["panelist"]
-            panelist_info["score"] = row["panelistscore"]
-            panelist_info["rank"] = row["showpnlrank"]
-            show_scores[show_date][panelist_slug] = panelist_info
+    version = data_version.probe.current(database_connection)
+    key = frozenset((panelist_slug_a, panelist_slug_b))
+    scores = pair_scores.get(key, version, _MISSING)
+    if scores is _MISSING:
+        scores = retrieve_common_scores(database_connection,
+                                        panelist_slug_a,
+                                        panelist_slug_b)
+        pair_scores.set(key, version, scores)
 
-    return show_scores
+    return scores
 
 #endregion
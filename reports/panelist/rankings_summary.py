@@ -4,8 +4,13 @@
 """WWDTM Panelist Rankings Summary Report Functions"""
 
 from collections import OrderedDict
-from typing import Dict
+from typing import Dict, List
 import mysql.connector
+import numpy
+
+from reports import snapshot
+
+RANK_KEYS = ("first", "first_tied", "second", "second_tied", "third")
 
 def retrieve_all_panelists(database_connection: mysql.connector.connect
                           ) -> Dict:
@@ -93,19 +98,59 @@ def retrieve_rankings_by_panelist(panelist_id: int,
 
     return rankings
 
+def calculate_rank_counts(show_snapshot: snapshot.ShowSnapshot,
+                          group_codes: numpy.ndarray,
+                          group_count: int) -> numpy.ndarray:
+    """Count the ranks of every non-Best Of and non-Repeat appearance
+    for each group in a single bincount over the encoded group and rank
+    codes. Returns a group by rank (1, 1t, 2, 2t, 3) count matrix"""
+
+    rank_count = len(snapshot.RANKS)
+    mask = show_snapshot.regular & (show_snapshot.rank != snapshot.NO_RANK)
+    codes = group_codes[mask] * rank_count + show_snapshot.rank[mask]
+    counts = numpy.bincount(codes, minlength=group_count * rank_count)
+    return counts.reshape(group_count, rank_count)
+
+def format_rankings(rank_counts: List[int]) -> Dict:
+    """Build the ranking statistics for a row of the rank count matrix,
+    including percentages and a list of ranks that can be iterated"""
+
+    total = sum(rank_counts)
+    rankings = OrderedDict()
+    for key, count in zip(RANK_KEYS, rank_counts):
+        rankings[key] = count
+
+    rankings["count"] = total
+
+    if total:
+        for key, count in zip(RANK_KEYS, rank_counts):
+            rankings["percent_{}".format(key)] = round(100 * (count / total), 4)
+
+    rankings["ranks"] = []
+    for rank, count in zip(snapshot.RANKS, rank_counts):
+        rank_info = OrderedDict()
+        rank_info["rank"] = rank
+        rank_info["count"] = count
+        rank_info["percent"] = round(100 * (count / total), 4) if total else 0.0
+        rankings["ranks"].append(rank_info)
+
+    return rankings
+
 def retrieve_all_panelist_rankings(database_connection: mysql.connector.connect
                                   ) -> Dict:
     """Returns ranking statistics for all available panelists"""
 
-    panelists = retrieve_all_panelists(database_connection)
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    panelists = show_snapshot.panelists_by_slug()
     if not panelists:
         return None
 
+    rank_counts = calculate_rank_counts(show_snapshot,
+                                        show_snapshot.panelist_pos,
+                                        len(show_snapshot.panelists_id)).tolist()
+
     panelist_rankings = OrderedDict()
-    for panelist in panelists:
-        panelist_id = panelists[panelist]["id"]
-        rankings = retrieve_rankings_by_panelist(panelist_id,
-                                                 database_connection)
-        panelist_rankings[panelist] = rankings
+    for panelist_slug, index in panelists:
+        panelist_rankings[panelist_slug] = format_rankings(rank_counts[index])
 
     return panelist_rankings
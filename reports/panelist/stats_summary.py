@@ -8,6 +8,8 @@ from typing import Dict, List, Text
 import mysql.connector
 import numpy
 
+from reports import grouped_stats, snapshot
+
 def retrieve_all_panelists(database_connection: mysql.connector.connect
                           ) -> Dict:
     """Retrieves a dictionary for all available panelists from the
@@ -101,31 +103,36 @@ def retrieve_all_panelists_stats(database_connection: mysql.connector.connect
     """Retrieve appearance and score statistics for all available
     panelists and calculates common statistics for each panelist"""
 
-    panelists = retrieve_all_panelists(database_connection)
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    panelists = show_snapshot.panelists_by_slug()
 
     if not panelists:
         return None
 
+    panelist_count = len(show_snapshot.panelists_id)
+    panelist_pos = show_snapshot.panelist_pos
+    regular = show_snapshot.regular
+    scored = regular & show_snapshot.has_score
+    regular_counts = numpy.bincount(panelist_pos[regular], minlength=panelist_count)
+    all_counts = numpy.bincount(panelist_pos, minlength=panelist_count)
+    scored_counts = numpy.bincount(panelist_pos[scored], minlength=panelist_count)
+    score_stats = grouped_stats.grouped_statistics(show_snapshot.score[scored],
+                                                   panelist_pos[scored])
+
     all_stats = OrderedDict()
-    for panelist_slug, _ in panelists.items():
+    for panelist_slug, index in panelists:
         all_stats[panelist_slug] = OrderedDict()
-        stats = OrderedDict()
 
-        appearance_data = retrieve_appearances_by_panelist(panelist_slug,
-                                                           database_connection)
+        appearance_data = OrderedDict()
+        appearance_data["regular"] = int(regular_counts[index])
+        appearance_data["all"] = int(all_counts[index])
+        appearance_data["with_scores"] = int(scored_counts[index])
         all_stats[panelist_slug]["appearances"] = appearance_data
 
-        scores = retrieve_scores_by_panelist(panelist_slug,
-                                             database_connection)
-
-        if scores:
-            stats["minimum"] = int(numpy.amin(scores))
-            stats["maximum"] = int(numpy.amax(scores))
-            stats["mean"] = round(numpy.mean(scores), 4)
-            stats["median"] = int(numpy.median(scores))
-            stats["standard_deviation"] = round(numpy.std(scores), 4)
-            stats["total"] = int(numpy.sum(scores))
-            all_stats[panelist_slug]["stats"] = stats
+        if index in score_stats:
+            all_stats[panelist_slug]["stats"] = grouped_stats.format_statistics(
+                score_stats[index]
+            )
         else:
             all_stats[panelist_slug]["stats"] = None
 
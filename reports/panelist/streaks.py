@@ -4,7 +4,7 @@
 """WWDTM Panelist Win/Loss Streaks Report Functions"""
 
 from collections import OrderedDict
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 import mysql.connector
 
 #region Retrieval Functions
@@ -34,36 +34,109 @@ def retrieve_panelists(database_connection: mysql.connector.connect
 
     return panelists
 
-def retrieve_panelist_ranks(panelist_id: int,
-                            database_connection: mysql.connector.connect
-                           ) -> List[Dict]:
-    """Retrieve a list of show dates and the panelist rank for the
-    requested panelist ID"""
+def retrieve_all_panelist_ranks(database_connection: mysql.connector.connect
+                               ) -> Dict[int, List[Dict]]:
+    """Retrieve show dates and panelist ranks for all panelists using a
+    single query. Returns a dictionary keyed by panelist ID with each
+    list of ranks ordered by show date"""
 
     cursor = database_connection.cursor()
-    query = ("SELECT s.showid, s.showdate, pm.showpnlrank "
+    query = ("SELECT pm.panelistid, s.showid, s.showdate, pm.showpnlrank "
              "FROM ww_showpnlmap pm "
              "JOIN ww_shows s ON s.showid = pm.showid "
-             "WHERE pm.panelistid = %s "
-             "AND s.bestof = 0 AND s.repeatshowid IS NULL "
+             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
              "AND pm.panelistscore IS NOT NULL "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_id,))
+             "ORDER BY pm.panelistid ASC, s.showdate ASC;")
+    cursor.execute(query)
     result = cursor.fetchall()
     cursor.close()
 
-    if not result:
-        return None
-
-    ranks = []
+    panelist_ranks = {}
     for row in result:
         info = OrderedDict()
-        info["show_id"] = row[0]
-        info["show_date"] = row[1].isoformat()
-        info["rank"] = row[2]
-        ranks.append(info)
+        info["show_id"] = row[1]
+        info["show_date"] = row[2].isoformat()
+        info["rank"] = row[3]
+        panelist_ranks.setdefault(row[0], []).append(info)
 
-    return ranks
+    return panelist_ranks
+
+#endregion
+
+#region Streak Engine
+STREAK_TYPES = OrderedDict([
+    ("win", lambda rank: rank == "1"),
+    ("win_with_draws", lambda rank: rank in ("1", "1t")),
+    ("loss", lambda rank: rank not in ("1", "1t")),
+    ("third", lambda rank: rank == "3"),
+])
+
+def calculate_streaks(ranks: List[Dict],
+                      streak_types: Optional[Dict[str, Callable[[str], bool]]] = None
+                     ) -> Dict[str, Dict]:
+    """Calculate the total count, longest streak and current streak
+    for each streak type in a single pass over the list of ranks.
+
+    Each streak type is a predicate that returns True if a rank counts
+    towards the streak. Streaks are recorded as start and end indices
+    into the list of ranks; when more than one streak has the longest
+    length, the earliest streak is kept."""
+
+    if streak_types is None:
+        streak_types = STREAK_TYPES
+
+    names = list(streak_types)
+    predicates = [streak_types[name] for name in names]
+    totals = [0] * len(names)
+    longest = [0] * len(names)
+    longest_start = [None] * len(names)
+    current = [0] * len(names)
+
+    for index, show in enumerate(ranks):
+        rank = show["rank"]
+        for streak, predicate in enumerate(predicates):
+            if predicate(rank):
+                totals[streak] += 1
+                current[streak] += 1
+                if current[streak] > longest[streak]:
+                    longest[streak] = current[streak]
+                    longest_start[streak] = index - current[streak] + 1
+            else:
+                current[streak] = 0
+
+    streaks = OrderedDict()
+    for streak, name in enumerate(names):
+        info = OrderedDict()
+        info["total"] = totals[streak]
+        info["longest"] = longest[streak]
+        info["longest_start"] = longest_start[streak]
+        info["longest_end"] = (longest_start[streak] + longest[streak] - 1
+                               if longest[streak] else None)
+        info["current"] = current[streak]
+        info["current_start"] = (len(ranks) - current[streak]
+                                 if current[streak] else None)
+        streaks[name] = info
+
+    return streaks
+
+def streak_show_dates(ranks: List[Dict],
+                      start: int,
+                      length: int) -> List[Dict]:
+    """Build the list of show information for a streak given its start
+    index and length"""
+
+    if start is None or not length:
+        return []
+
+    shows = []
+    for show in ranks[start:start + length]:
+        show_info = OrderedDict()
+        show_info["show_id"] = show["show_id"]
+        show_info["show_date"] = show["show_date"]
+        show_info["show_rank"] = show["rank"]
+        shows.append(show_info)
+
+    return shows
 
 #endregion
 
@@ -73,66 +146,27 @@ def calculate_panelist_losing_streaks(panelists: List[Dict],
     """Retrieve panelist stats and calculate their losing streaks"""
 
     losing_streaks = []
+    all_ranks = retrieve_all_panelist_ranks(database_connection)
 
     for panelist in panelists:
-        longest_losing_streak = 0
-        longest_losing_streak_show_dates = []
-        longest_third_streak = 0
-        longest_third_streak_show_dates = []
-        total_losses = 0
-        total_third_losses = 0
-
-        shows = retrieve_panelist_ranks(panelist["id"], database_connection)
+        shows = all_ranks.get(panelist["id"])
         if shows:
-            # Calculate losing streaks
-            current_streak = 0
-            current_streak_show_dates = []
-            for show in shows:
-                if show["rank"] != "1" and show["rank"] != "1t":
-                    # Placed 2nd, 2nd tied or 3rd
-                    total_losses += 1
-                    current_streak += 1
-
-                    show_info = OrderedDict()
-                    show_info["show_id"] = show["show_id"]
-                    show_info["show_date"] = show["show_date"]
-                    show_info["show_rank"] = show["rank"]
-                    current_streak_show_dates.append(show_info)
-
-                    if current_streak > longest_losing_streak:
-                        longest_losing_streak = current_streak
-                        longest_losing_streak_show_dates = current_streak_show_dates
-                else:
-                    current_streak = 0
-                    current_streak_show_dates = []
-
-            current_third_streak = 0
-            current_third_streak_show_dates = []
-            for show in shows:
-                if show["rank"] == "3":
-                    # Placed 3rd
-                    total_third_losses += 1
-                    current_third_streak += 1
-
-                    show_info = OrderedDict()
-                    show_info["show_id"] = show["show_id"]
-                    show_info["show_date"] = show["show_date"]
-                    show_info["show_rank"] = show["rank"]
-                    current_third_streak_show_dates.append(show_info)
-
-                    if current_third_streak > longest_third_streak:
-                        longest_third_streak = current_third_streak
-                        longest_third_streak_show_dates = current_third_streak_show_dates
-                else:
-                    current_third_streak = 0
-                    current_third_streak_show_dates = []
-
-            panelist["total_losses"] = total_losses
-            panelist["total_third_losses"] = total_third_losses
-            panelist["longest_streak"] = longest_losing_streak
-            panelist["longest_streak_dates"] = longest_losing_streak_show_dates
-            panelist["longest_third_streak"] = longest_third_streak
-            panelist["longest_third_streak_dates"] = longest_third_streak_show_dates
+            streaks = calculate_streaks(shows)
+            loss = streaks["loss"]
+            third = streaks["third"]
+
+            panelist["total_losses"] = loss["total"]
+            panelist["total_third_losses"] = third["total"]
+            panelist["longest_streak"] = loss["longest"]
+            panelist["longest_streak_dates"] = streak_show_dates(shows,
+                                                                 loss["longest_start"],
+                                                                 loss["longest"])
+            panelist["longest_third_streak"] = third["longest"]
+            panelist["longest_third_streak_dates"] = streak_show_dates(shows,
+                                                                       third["longest_start"],
+                                                                       third["longest"])
+            panelist["current_streak"] = loss["current"]
+            panelist["current_third_streak"] = third["current"]
             losing_streaks.append(panelist)
 
     return losing_streaks
@@ -142,65 +176,27 @@ def calculate_panelist_win_streaks(panelists: List[Dict],
     """Retrieve panelist stats and calculate their win streaks"""
 
     win_streaks = []
+    all_ranks = retrieve_all_panelist_ranks(database_connection)
 
     for panelist in panelists:
-        longest_streak = 0
-        longest_streak_show_dates = []
-        longest_streak_with_draws = 0
-        longest_streak_show_dates_with_draws = []
-        total_wins = 0
-        total_wins_with_draws = 0
-
-        shows = retrieve_panelist_ranks(panelist["id"], database_connection)
+        shows = all_ranks.get(panelist["id"])
         if shows:
-            # Calculate win streaks
-            current_streak = 0
-            current_streak_show_dates = []
-            for show in shows:
-                if show["rank"] == "1":
-                    total_wins += 1
-                    current_streak += 1
-
-                    show_info = OrderedDict()
-                    show_info["show_id"] = show["show_id"]
-                    show_info["show_date"] = show["show_date"]
-                    show_info["show_rank"] = show["rank"]
-                    current_streak_show_dates.append(show_info)
-
-                    if current_streak > longest_streak:
-                        longest_streak = current_streak
-                        longest_streak_show_dates = current_streak_show_dates
-                else:
-                    current_streak = 0
-                    current_streak_show_dates = []
-
-            # Calculate win streaks with draws
-            current_streak_with_draws = 0
-            current_streak_show_dates_with_draws = []
-            for show in shows:
-                if show["rank"] == "1" or show["rank"] == "1t":
-                    total_wins_with_draws += 1
-                    current_streak_with_draws += 1
-
-                    show_info = OrderedDict()
-                    show_info["show_id"] = show["show_id"]
-                    show_info["show_date"] = show["show_date"]
-                    show_info["show_rank"] = show["rank"]
-                    current_streak_show_dates_with_draws.append(show_info)
-
-                    if current_streak_with_draws > longest_streak_with_draws:
-                        longest_streak_with_draws = current_streak_with_draws
-                        longest_streak_show_dates_with_draws = current_streak_show_dates_with_draws
-                else:
-                    current_streak_with_draws = 0
-                    current_streak_show_dates_with_draws = []
-
-            panelist["total_wins"] = total_wins
-            panelist["total_wins_with_draws"] = total_wins_with_draws
-            panelist["longest_streak"] = longest_streak
-            panelist["longest_streak_dates"] = longest_streak_show_dates
-            panelist["longest_streak_with_draws"] = longest_streak_with_draws
-            panelist["longest_streak_with_draws_dates"] = longest_streak_show_dates_with_draws
+            streaks = calculate_streaks(shows)
+            win = streaks["win"]
+            win_with_draws = streaks["win_with_draws"]
+
+            panelist["total_wins"] = win["total"]
+            panelist["total_wins_with_draws"] = win_with_draws["total"]
+            panelist["longest_streak"] = win["longest"]
+            panelist["longest_streak_dates"] = streak_show_dates(shows,
+                                                                 win["longest_start"],
+                                                                 win["longest"])
+            panelist["longest_streak_with_draws"] = win_with_draws["longest"]
+            panelist["longest_streak_with_draws_dates"] = streak_show_dates(
+                shows, win_with_draws["longest_start"], win_with_draws["longest"]
+            )
+            panelist["current_streak"] = win["current"]
+            panelist["current_streak_with_draws"] = win_with_draws["current"]
             win_streaks.append(panelist)
 
     return win_streaks
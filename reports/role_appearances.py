@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""Shared show role appearance summary functions used by the Reports
+Site"""
+
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Text, Tuple
+import mysql.connector
+
+#region Role Definitions
+class ShowRole(NamedTuple):
+    """Tables and columns used to summarize appearances for a show
+    role, such as host or scorekeeper. Table and column names are
+    inserted directly into queries and must never come from user
+    input"""
+
+    map_table: Text
+    entity_table: Text
+    id_column: Text
+    name_column: Text
+    slug_column: Text
+    excluded_names: Tuple[Text, ...] = ()
+
+HOST = ShowRole(map_table="ww_showhostmap",
+                entity_table="ww_hosts",
+                id_column="hostid",
+                name_column="host",
+                slug_column="hostslug",
+                excluded_names=("(TBD)", ))
+
+SCOREKEEPER = ShowRole(map_table="ww_showskmap",
+                       entity_table="ww_scorekeepers",
+                       id_column="scorekeeperid",
+                       name_column="scorekeeper",
+                       slug_column="scorekeeperslug",
+                       excluded_names=("(TBD)", ))
+
+#endregion
+
+#region Retrieval Functions
+def _isoformat(value) -> Optional[Text]:
+    """Return the ISO formatted date, or None if no date is set"""
+    if not value:
+        return None
+
+    return value.isoformat()
+
+def retrieve_role_appearance_summaries(role: ShowRole,
+                                       database_connection: mysql.connector.connect,
+                                       slug: Optional[Text] = None
+                                      ) -> Dict:
+    """Retrieve appearance counts and first and most recent appearance
+    dates, for both regular and all shows, for every entity of the
+    requested show role using a single conditional aggregation query.
+
+    If a slug is passed in, only the summary for that entity is
+    retrieved. Returns an OrderedDict keyed by slug and ordered by slug"""
+
+    conditions = []
+    parameters = []
+    if role.excluded_names:
+        conditions.append("e.{} NOT IN ({})".format(
+            role.name_column, ", ".join(["%s"] * len(role.excluded_names))))
+        parameters.extend(role.excluded_names)
+
+    if slug:
+        conditions.append("e.{} = %s".format(role.slug_column))
+        parameters.append(slug)
+
+    where = "WHERE {} ".format(" AND ".join(conditions)) if conditions else ""
+
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT e.{id} AS id, e.{name} AS name, e.{slug} AS slug, "
+             "COUNT(CASE WHEN s.bestof = 0 AND s.repeatshowid IS NULL "
+             " THEN m.showid END) AS regular, "
+             "COUNT(s.showid) AS allshows, "
+             "MIN(CASE WHEN s.bestof = 0 AND s.repeatshowid IS NULL "
+             " THEN s.showdate END) AS first, "
+             "MAX(CASE WHEN s.bestof = 0 AND s.repeatshowid IS NULL "
+             " THEN s.showdate END) AS most_recent, "
+             "MIN(s.showdate) AS first_all, "
+             "MAX(s.showdate) AS most_recent_all "
+             "FROM {entity_table} e "
+             "LEFT JOIN {map_table} m ON m.{id} = e.{id} "
+             "LEFT JOIN ww_shows s ON s.showid = m.showid "
+             "{where}"
+             "GROUP BY e.{id}, e.{name}, e.{slug} "
+             "ORDER BY e.{slug} ASC;").format(id=role.id_column,
+                                              name=role.name_column,
+                                              slug=role.slug_column,
+                                              entity_table=role.entity_table,
+                                              map_table=role.map_table,
+                                              where=where)
+    cursor.execute(query, tuple(parameters))
+    result = cursor.fetchall()
+    cursor.close()
+
+    if not result:
+        return None
+
+    summaries = OrderedDict()
+    for row in result:
+        info = OrderedDict()
+        info["slug"] = row["slug"]
+        info["name"] = row["name"]
+        info["regular_shows"] = row["regular"]
+        info["all_shows"] = row["allshows"]
+        info["first"] = _isoformat(row["first"])
+        info["first_all"] = _isoformat(row["first_all"])
+        info["most_recent"] = _isoformat(row["most_recent"])
+        info["most_recent_all"] = _isoformat(row["most_recent_all"])
+        summaries[row["slug"]] = info
+
+    return summaries
+
+#endregion
@@ -4,73 +4,65 @@
 """WWDTM Scorekeeper Introductions Report Functions"""
 
 from collections import OrderedDict
-from typing import List, Dict
+from itertools import chain, groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple
 import mysql.connector
 
 #region Retrieval Functions
-def retrieve_scorekeepers_with_introductions(database_connection: mysql.connector.connect
-                                            ) -> List[Dict]:
-    """Retrieve a list of scorekeepers that have show introduction entries
-    in the database"""
+def iterate_scorekeeper_introductions(database_connection: mysql.connector.connect
+                                     ) -> Iterator[Tuple[Dict, Iterator[Dict]]]:
+    """Yield each scorekeeper that has show introduction entries along
+    with an iterator of their introductions, streamed from a single
+    ordered query as the rows are read. Each scorekeeper's introductions
+    must be read before moving on to the next scorekeeper and the
+    database connection cannot be used for other queries until the
+    generator is exhausted or closed"""
 
-    scorekeepers = []
     cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT DISTINCT sk.scorekeeperid, sk.scorekeeper, "
-             "sk.scorekeeperslug "
+    query = ("SELECT sk.scorekeeperid, sk.scorekeeper, sk.scorekeeperslug, "
+             "s.showid, s.showdate, s.bestof, s.repeatshowid, "
+             "skm.description "
              "FROM ww_showskmap skm "
              "JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid "
+             "JOIN ww_shows s ON s.showid = skm.showid "
              "WHERE skm.description IS NOT NULL "
-             "ORDER BY sk.scorekeeper ASC;")
+             "ORDER BY sk.scorekeeper ASC, sk.scorekeeperid ASC, "
+             "s.showdate ASC;")
     cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
 
-    if not result:
-        return None
+    try:
+        for scorekeeper_id, rows in groupby(cursor, key=itemgetter("scorekeeperid")):
+            first_row = next(rows)
+            scorekeeper_info = OrderedDict()
+            scorekeeper_info["id"] = scorekeeper_id
+            scorekeeper_info["name"] = first_row["scorekeeper"]
+            scorekeeper_info["slug"] = first_row["scorekeeperslug"]
 
-    for row in result:
-        scorekeeper_info = OrderedDict()
-        scorekeeper_info["id"] = row["scorekeeperid"]
-        scorekeeper_info["name"] = row["scorekeeper"]
-        scorekeeper_info["slug"] = row["scorekeeperslug"]
-        scorekeepers.append(scorekeeper_info)
+            yield scorekeeper_info, map(_introduction, chain([first_row], rows))
+    finally:
+        if database_connection.unread_result:
+            database_connection.consume_results()
+        cursor.close()
 
-    return scorekeepers
+def _introduction(row: Dict) -> Dict:
+    """Build the show information for an introduction row"""
 
-def retrieve_all_scorekeeper_introductions(database_connection: mysql.connector.connect
-                                          ) -> Dict:
-    """Retrieve all scorekeeper introductions from the database"""
+    show_info = OrderedDict()
+    show_info["id"] = row["showid"]
+    show_info["date"] = row["showdate"].isoformat()
+    show_info["best_of"] = bool(row["bestof"])
+    show_info["repeat_show"] = bool(row["repeatshowid"])
+    show_info["introduction"] = row["description"]
+    return show_info
 
-    scorekeepers = retrieve_scorekeepers_with_introductions(database_connection)
-    all_introductions = OrderedDict()
+def retrieve_scorekeeper_introductions(database_connection: mysql.connector.connect
+                                      ) -> List[Tuple[Dict, List[Dict]]]:
+    """Retrieve a list of scorekeepers that have show introduction
+    entries, each paired with their list of introductions, using a
+    single query"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    for scorekeeper in scorekeepers:
-        scorekeeper_intros = []
-        query = ("SELECT s.showid, s.showdate, s.bestof, s.repeatshowid, "
-                 "skm.description "
-                 "FROM ww_showskmap skm "
-                 "JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid "
-                 "JOIN ww_shows s ON s.showid = skm.showid "
-                 "WHERE sk.scorekeeperid = %s "
-                 "AND skm.description IS NOT NULL "
-                 "ORDER BY s.showdate ASC;")
-        cursor.execute(query, (scorekeeper["id"],))
-        result = cursor.fetchall()
-
-        if result:
-            for row in result:
-                show_info = OrderedDict()
-                show_info["id"] = row["showid"]
-                show_info["date"] = row["showdate"].isoformat()
-                show_info["best_of"] = bool(row["bestof"])
-                show_info["repeat_show"] = bool(row["repeatshowid"])
-                show_info["introduction"] = row["description"]
-                scorekeeper_intros.append(show_info)
-
-        all_introductions[scorekeeper["id"]] = scorekeeper_intros
-
-    cursor.close()
-    return all_introductions
+    return [(scorekeeper, list(shows))
+            for scorekeeper, shows in iterate_scorekeeper_introductions(database_connection)]
 
 #endregion
@@ -28,10 +28,17 @@ def retrieve_shows_guest_scorekeeper(database_connection: mysql.connector.connec
              "ORDER BY s.showdate ASC ")
     cursor.execute(query)
     result = cursor.fetchall()
+    cursor.close()
 
     if not result:
         return None
 
+    show_ids = [row["showid"] for row in result]
+    show_panelists = show_details.retrieve_panelists_by_show_ids(show_ids,
+                                                                 database_connection)
+    show_guests = show_details.retrieve_guests_by_show_ids(show_ids,
+                                                           database_connection)
+
     for row in result:
         show = OrderedDict()
         show_id = row["showid"]
@@ -47,10 +54,8 @@ def retrieve_shows_guest_scorekeeper(database_connection: mysql.connector.connec
         show["host_guest"] = bool(row["host_guest"])
         show["scorekeeper"] = row["scorekeeper"]
         show["scorekeeper_slug"] = row["scorekeeperslug"]
-        show["panelists"] = show_details.retrieve_show_panelists(show_id,
-                                                                 database_connection)
-        show["guests"] = show_details.retrieve_show_guests(show_id,
-                                                           database_connection)
+        show["panelists"] = show_panelists.get(show_id)
+        show["guests"] = show_guests.get(show_id)
         shows.append(show)
 
     return shows
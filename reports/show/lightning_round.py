@@ -4,74 +4,108 @@
 """WWDTM Lightning Round Report Functions"""
 
 from collections import OrderedDict
-from typing import List, Dict
+from typing import List, Dict, Optional
 import mysql.connector
+import numpy
+
+from reports import snapshot
+from reports.cache import VersionedLRUCache
+
+# Excluding 25th anniversary special from starting score ties
+EXCLUDED_START_DATES = numpy.array(["2018-10-27"], dtype="datetime64[D]")
+
+#region Lightning Round Analysis Class
+class LightningRoundAnalysis:
+    """Per-show and per-appearance Lightning Fill-in-the-Blank round
+    classifications calculated from a show snapshot"""
+
+    def __init__(self, show_snapshot: snapshot.ShowSnapshot):
+        self.snapshot = show_snapshot
+        show_count = len(show_snapshot.shows_id)
+        show_pos = show_snapshot.show_pos
+        regular = show_snapshot.regular
+
+        # Shows starting the round in a tie: all recorded starting scores
+        # for a show have the same value
+        start = show_snapshot.lightning_start
+        start_mask = (regular & ~numpy.isnan(start)
+                      & ~numpy.isin(show_snapshot.show_date, EXCLUDED_START_DATES))
+        self.start_count = numpy.bincount(show_pos[start_mask], minlength=show_count)
+        self.start_min = numpy.full(show_count, numpy.inf)
+        self.start_max = numpy.full(show_count, -numpy.inf)
+        numpy.minimum.at(self.start_min, show_pos[start_mask], start[start_mask])
+        numpy.maximum.at(self.start_max, show_pos[start_mask], start[start_mask])
+        self.start_tie = (self.start_count > 0) & (self.start_min == self.start_max)
+
+        # Shows ending the round in a tie: three panelists ranked first
+        # tied with the same final score
+        score = show_snapshot.score
+        end_mask = regular & (show_snapshot.rank == snapshot.RANK_CODES["1t"])
+        end_count = numpy.bincount(show_pos[end_mask], minlength=show_count)
+        self.end_min = numpy.full(show_count, numpy.inf)
+        end_max = numpy.full(show_count, -numpy.inf)
+        numpy.minimum.at(self.end_min, show_pos[end_mask], score[end_mask])
+        numpy.maximum.at(end_max, show_pos[end_mask], score[end_mask])
+        self.end_tie = (end_count == 3) & (self.end_min == end_max)
+
+        self.start_end_tie = self.start_tie & self.end_tie
+
+        # Individual panelist appearances
+        self.zero_start = regular & (start == 0)
+        self.zero_correct = regular & (show_snapshot.lightning_correct == 0)
+
+        # Appearance rows for each show, in panel order
+        order = numpy.argsort(show_pos, kind="stable")
+        boundaries = numpy.searchsorted(show_pos[order], numpy.arange(show_count + 1))
+        self._show_rows = [order[boundaries[pos]:boundaries[pos + 1]]
+                           for pos in range(show_count)]
+
+    def show_panelists(self, show_pos: int) -> List[Dict]:
+        """Return the list of panelists for a show"""
+        panelists = []
+        for row in self._show_rows[show_pos]:
+            index = self.snapshot.panelist_pos[row]
+            panelist = OrderedDict()
+            panelist["id"] = int(self.snapshot.panelists_id[index])
+            panelist["name"] = self.snapshot.panelists_name[index]
+            panelist["slug"] = self.snapshot.panelists_slug[index]
+            panelists.append(panelist)
+
+        return panelists or None
+
+    def show_rows(self, show_pos: int) -> numpy.ndarray:
+        """Return the appearance row indices for a show"""
+        return self._show_rows[show_pos]
+
+    def shows(self, mask: numpy.ndarray) -> List[int]:
+        """Return the show positions selected by a per-show mask, in
+        show date order"""
+        return numpy.flatnonzero(mask).tolist()
 
-#region Retrieval Functions
-def retrieve_all_lightning_round_start(database_connection: mysql.connector.connect
-                                      ) -> Dict:
-    """Retrieve all Lightning Fill-in-the-Blank round starting scores
-    and return the values as an OrderedDict"""
+#endregion
 
-    show_lightning_round_starts = OrderedDict()
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, p.panelistid, p.panelist, "
-             "pm.panelistlrndstart "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND s.showdate <> '2018-10-27' " # Excluding 25th anniversary special
-             "AND pm.panelistlrndstart IS NOT NULL "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
+#region Retrieval Functions
+_analysis_cache = VersionedLRUCache(max_entries=1)
 
-    if not result:
+def _value(value: float) -> Optional[int]:
+    """Convert a snapshot value into an int, or None if missing"""
+    if numpy.isnan(value):
         return None
 
-    for row in result:
-        show_id = row["showid"]
-        if show_id not in show_lightning_round_starts:
-            show_lightning_round_starts[show_id] = OrderedDict()
-            show_lightning_round_starts[show_id]["id"] = show_id
-            show_lightning_round_starts[show_id]["date"] = row["showdate"].isoformat()
-            show_lightning_round_starts[show_id]["scores"] = []
+    return int(value)
 
-        show_lightning_round_starts[show_id]["scores"].append(row["panelistlrndstart"])
+def retrieve_lightning_round_analysis(database_connection: mysql.connector.connect
+                                     ) -> LightningRoundAnalysis:
+    """Return the Lightning round analysis for the current snapshot,
+    re-using the cached analysis until the data changes"""
 
-    return show_lightning_round_starts
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    analysis = _analysis_cache.get("analysis", show_snapshot.version)
+    if analysis is None or analysis.snapshot is not show_snapshot:
+        analysis = _analysis_cache.set("analysis", show_snapshot.version,
+                                       LightningRoundAnalysis(show_snapshot))
 
-def retrieve_scoring_info_by_show_id(show_id: int,
-                                     database_connection: mysql.connector.connect
-                                    ) -> Dict:
-    """Return Lightning round starting points, number of correct
-    answers and final score for the requested show ID. Used for
-    getting scoring details where the round starts in a three-way tie."""
-
-    info = OrderedDict()
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showdate, pm.panelistlrndstart, "
-             "pm.panelistlrndcorrect, pm.panelistscore "
-             "FROM ww_shows s "
-             "JOIN ww_showpnlmap pm ON pm.showid = s.showid "
-             "WHERE s.showid = %s "
-             "LIMIT 1;")
-    cursor.execute(query, (show_id, ))
-    result = cursor.fetchone()
-    cursor.close()
-
-    if not result:
-        return None
-
-    info["id"] = show_id
-    info["date"] = result["showdate"].isoformat()
-    info["start"] = result["panelistlrndstart"]
-    info["correct"] = result["panelistlrndcorrect"]
-    info["score"] = result["panelistscore"]
-
-    return info
+    return analysis
 
 def retrieve_panelists_by_show_id(show_id: int,
                                   database_connection: mysql.connector.connect
@@ -102,145 +136,70 @@ def retrieve_panelists_by_show_id(show_id: int,
 
     return panelists
 
-def shows_with_lightning_round_start_zero(database_connection: mysql.connector.connect
-                                         ) -> List[Dict]:
-    """Return shows in which panelists start the Lightning
-    Fill-in-the-Blank round with zero points"""
+def _panelist_appearances(analysis: LightningRoundAnalysis,
+                          mask: numpy.ndarray) -> List[Dict]:
+    """Build the list of shows and panelist details for the panelist
+    appearances selected by the mask"""
 
+    show_snapshot = analysis.snapshot
     shows = []
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, p.panelistid, p.panelist, "
-             "pm.panelistlrndstart, pm.panelistlrndcorrect, pm.panelistscore, "
-             "pm.showpnlrank "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND pm.panelistlrndstart = 0 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
+    for row in numpy.flatnonzero(mask):
+        index = show_snapshot.panelist_pos[row]
+        rank = show_snapshot.rank[row]
 
-    if not result:
-        return None
-
-    for row in result:
         show = OrderedDict()
-        show["id"] = row["showid"]
-        show["date"] = row["showdate"].isoformat()
+        show["id"] = int(show_snapshot.show_id[row])
+        show["date"] = str(show_snapshot.show_date[row])
         panelist = OrderedDict()
-        panelist["id"] = row["panelistid"]
-        panelist["name"] = row["panelist"]
-        panelist["start"] = row["panelistlrndstart"]
-        panelist["correct"] = row["panelistlrndcorrect"]
-        panelist["score"] = row["panelistscore"]
-        panelist["rank"] = row["showpnlrank"]
+        panelist["id"] = int(show_snapshot.panelists_id[index])
+        panelist["name"] = show_snapshot.panelists_name[index]
+        panelist["start"] = _value(show_snapshot.lightning_start[row])
+        panelist["correct"] = _value(show_snapshot.lightning_correct[row])
+        panelist["score"] = _value(show_snapshot.score[row])
+        panelist["rank"] = snapshot.RANKS[rank] if rank != snapshot.NO_RANK else None
         show["panelist"] = panelist
         shows.append(show)
 
     return shows
 
+def shows_with_lightning_round_start_zero(database_connection: mysql.connector.connect
+                                         ) -> List[Dict]:
+    """Return shows in which panelists start the Lightning
+    Fill-in-the-Blank round with zero points"""
+
+    return shows_lightning_round_start_zero(database_connection)
+
 def shows_lightning_round_start_zero(database_connection: mysql.connector.connect
                                     ) -> List[Dict]:
     """Return list of shows in which a panelist starts the Lightning
     Fill-in-the-Blank round with zero points"""
 
-    shows = []
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, p.panelistid, p.panelist, "
-             "pm.panelistlrndstart, pm.panelistlrndcorrect, pm.panelistscore, "
-             "pm.showpnlrank "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND pm.panelistlrndstart = 0 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    for row in result:
-        show = OrderedDict()
-        show["id"] = row["showid"]
-        show["date"] = row["showdate"].isoformat()
-        panelist = OrderedDict()
-        panelist["id"] = row["panelistid"]
-        panelist["name"] = row["panelist"]
-        panelist["start"] = row["panelistlrndstart"]
-        panelist["correct"] = row["panelistlrndcorrect"]
-        panelist["score"] = row["panelistscore"]
-        panelist["rank"] = row["showpnlrank"]
-        show["panelist"] = panelist
-        shows.append(show)
-
-    return shows
+    analysis = retrieve_lightning_round_analysis(database_connection)
+    return _panelist_appearances(analysis, analysis.zero_start) or None
 
 def show_lightning_round_zero_correct(database_connection: mysql.connector.connect
                                      ) -> List[Dict]:
     """Return list of shows in which a panelist answers zero Lightning
     Fill-in-the-Blank round questions correct"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, p.panelistid, p.panelist, "
-             "pm.panelistlrndstart, pm.panelistlrndcorrect, "
-             "pm.panelistscore, pm.showpnlrank "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS null "
-             "AND pm.panelistlrndcorrect = 0 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    shows = []
-    for row in result:
-        show = OrderedDict()
-        show["id"] = row["showid"]
-        show["date"] = row["showdate"].isoformat()
-        panelist = OrderedDict()
-        panelist["id"] = row["panelistid"]
-        panelist["name"] = row["panelist"]
-        panelist["start"] = row["panelistlrndstart"]
-        panelist["correct"] = row["panelistlrndcorrect"]
-        panelist["score"] = row["panelistscore"]
-        panelist["rank"] = row["showpnlrank"]
-        show["panelist"] = panelist
-        shows.append(show)
-
-    return shows
-
+    analysis = retrieve_lightning_round_analysis(database_connection)
+    return _panelist_appearances(analysis, analysis.zero_correct) or None
 
 def shows_starting_with_three_way_tie(database_connection: mysql.connector.connect
                                      ) -> List[Dict]:
     """Retrieve all shows in which all three panelists started the
     Lightning round in a three-way tie"""
 
-    show_scores = retrieve_all_lightning_round_start(database_connection)
+    analysis = retrieve_lightning_round_analysis(database_connection)
+    show_snapshot = analysis.snapshot
     shows = []
-
-    for show in show_scores:
-        show_id = show_scores[show]["id"]
-        show_date = show_scores[show]["date"]
-
-        if len(set(show_scores[show]["scores"])) == 1:
-            show_info = OrderedDict()
-            show_info["id"] = show_id
-            show_info["date"] = show_date
-            show_info["score"] = show_scores[show]["scores"][0]
-            panelists = retrieve_panelists_by_show_id(show_id=show_id,
-                                                      database_connection=database_connection)
-            show_info["panelists"] = panelists
-            shows.append(show_info)
+    for show_pos in analysis.shows(analysis.start_tie):
+        show_info = OrderedDict()
+        show_info["id"] = int(show_snapshot.shows_id[show_pos])
+        show_info["date"] = str(show_snapshot.shows_date[show_pos])
+        show_info["score"] = int(analysis.start_min[show_pos])
+        show_info["panelists"] = analysis.show_panelists(show_pos)
+        shows.append(show_info)
 
     return shows
 
@@ -249,77 +208,38 @@ def shows_ending_with_three_way_tie(database_connection: mysql.connector.connect
     """Retrieve all shows in which all three panelists ended the
     Lightning round in a three-way tie"""
 
+    analysis = retrieve_lightning_round_analysis(database_connection)
+    show_snapshot = analysis.snapshot
     shows = []
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.showdate, pm.panelistscore, "
-             "COUNT(pm.showpnlrank) "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE s.bestof = 0 AND s.repeatshowid IS NULL "
-             "AND pm.showpnlrank = '1t' "
-             "GROUP BY s.showid, pm.panelistscore "
-             "HAVING COUNT(pm.showpnlrank) = 3 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query)
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    for row in result:
+    for show_pos in analysis.shows(analysis.end_tie):
         show = OrderedDict()
-        show["id"] = row["showid"]
-        show["date"] = row["showdate"].isoformat()
-        show["score"] = row["panelistscore"]
-        show["panelists"] = retrieve_panelists_by_show_id(show_id=show["id"],
-                                                          database_connection=database_connection)
+        show["id"] = int(show_snapshot.shows_id[show_pos])
+        show["date"] = str(show_snapshot.shows_date[show_pos])
+        show["score"] = int(analysis.end_min[show_pos])
+        show["panelists"] = analysis.show_panelists(show_pos)
         shows.append(show)
 
-    return shows
+    return shows or None
 
 def shows_starting_ending_three_way_tie(database_connection: mysql.connector.connect
                                        ) -> List[Dict]:
     """Retrieve all shows in which all three panelists started and
     ended the Lightning round in a three-way tie"""
 
-    start_tie = shows_starting_with_three_way_tie(database_connection)
-    end_tie = shows_ending_with_three_way_tie(database_connection)
-
-    if not start_tie or not end_tie:
-        return None
-
-    start_tie_ids = []
-    end_tie_ids = []
-
-    for start_tie_show in start_tie:
-        start_tie_ids.append(start_tie_show["id"])
-
-    for end_tie_show in end_tie:
-        end_tie_ids.append(end_tie_show["id"])
-
-    shows_intersect = set(start_tie_ids) & set(end_tie_ids)
-
-    if not shows_intersect:
-        return None
-
+    analysis = retrieve_lightning_round_analysis(database_connection)
+    show_snapshot = analysis.snapshot
     show_info = []
-    for show_id in shows_intersect:
+    for show_pos in analysis.shows(analysis.start_end_tie):
+        row = analysis.show_rows(show_pos)[0]
         info = OrderedDict()
-        score_info = retrieve_scoring_info_by_show_id(show_id,
-                                                      database_connection)
-
-        if score_info:
-            info["id"] = show_id
-            info["date"] = score_info["date"]
-            info["panelists"] = retrieve_panelists_by_show_id(show_id,
-                                                              database_connection)
-            info["start"] = score_info["start"]
-            info["correct"] = score_info["correct"]
-            info["score"] = score_info["score"]
-            show_info.append(info)
-
-    return show_info
+        info["id"] = int(show_snapshot.shows_id[show_pos])
+        info["date"] = str(show_snapshot.shows_date[show_pos])
+        info["panelists"] = analysis.show_panelists(show_pos)
+        info["start"] = _value(show_snapshot.lightning_start[row])
+        info["correct"] = _value(show_snapshot.lightning_correct[row])
+        info["score"] = _value(show_snapshot.score[row])
+        show_info.append(info)
+
+    return show_info or None
 
 #endregion
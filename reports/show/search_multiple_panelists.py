@@ -4,12 +4,91 @@
 """WWDTM Search Shows by Multiple Selected Panelists Report Functions"""
 
 from collections import OrderedDict
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import mysql.connector
+import numpy
 
+from reports import snapshot
+from reports.cache import VersionedLRUCache
 from . import show_details as details
 
+#region Panelist Show Index Class
+class PanelistShowIndex:
+    """Inverted index from panelist slug to a bitmap of the shows that
+    panelist has appeared on, built from a show snapshot. Bitmaps are
+    boolean arrays aligned with the snapshot show dimension, which is
+    in show date order"""
+
+    def __init__(self, show_snapshot: snapshot.ShowSnapshot):
+        self.snapshot = show_snapshot
+        show_count = len(show_snapshot.shows_id)
+        self.bitmaps = numpy.zeros((len(show_snapshot.panelists_id), show_count),
+                                   dtype=bool)
+        self.bitmaps[show_snapshot.panelist_pos, show_snapshot.show_pos] = True
+
+        best_of = show_snapshot.shows_best_of
+        repeat = show_snapshot.shows_repeat
+        self.regular = ~best_of & ~repeat
+        self.best_of_only = best_of & ~repeat
+        self.repeat_only = repeat & ~best_of
+        self.repeat_best_of = best_of & repeat
+
+    def shows_mask(self, include_best_of: bool = False,
+                   include_repeats: bool = False) -> numpy.ndarray:
+        """Return a bitmap of shows allowed by the Best Of and Repeat
+        filters"""
+        mask = self.regular.copy()
+        if include_best_of:
+            mask |= self.best_of_only
+
+        if include_repeats:
+            mask |= self.repeat_only
+
+        if include_best_of or include_repeats:
+            mask |= self.repeat_best_of
+
+        return mask
+
+    def panelist_bitmap(self, panelist_slug: str) -> Optional[numpy.ndarray]:
+        """Return the show bitmap for a panelist, or None if the slug
+        is not valid"""
+        index = self.snapshot.panelist_slug_index.get(panelist_slug)
+        if index is None:
+            return None
+
+        return self.bitmaps[index]
+
+    def search(self, panelist_slugs: Iterable[str],
+               exclude_panelist_slugs: Optional[Iterable[str]] = None,
+               include_best_of: bool = False,
+               include_repeats: bool = False) -> List[int]:
+        """Return the IDs of shows, in show date order, whose panel
+        includes all of the requested panelists and none of the
+        excluded panelists"""
+        panelist_slugs = list(dict.fromkeys(panelist_slugs))
+        if not panelist_slugs:
+            return []
+
+        mask = self.shows_mask(include_best_of, include_repeats)
+        for panelist_slug in panelist_slugs:
+            bitmap = self.panelist_bitmap(panelist_slug)
+            if bitmap is None:
+                return []
+
+            mask &= bitmap
+
+        for panelist_slug in exclude_panelist_slugs or []:
+            bitmap = self.panelist_bitmap(panelist_slug)
+            if bitmap is not None:
+                mask &= ~bitmap
+
+        return self.snapshot.shows_id[mask].tolist()
+
+#endregion
+
 #region Retrieval Functions
+_index_cache = VersionedLRUCache(max_entries=1)
+
 def retrieve_panelist_slugs(database_connection: mysql.connector.connect
                            ) -> List[str]:
     """Returns a list of valid panelist slugs"""
@@ -55,6 +134,19 @@ def retrieve_details(show_id: int,
                     ) -> List[Dict]:
     """Retrieve show details for the requested show ID"""
 
+    return retrieve_details_by_show_ids([show_id], database_connection).get(show_id)
+
+def retrieve_details_by_show_ids(show_ids: List[int],
+                                 database_connection: mysql.connector.connect
+                                ) -> Dict[int, Dict]:
+    """Retrieve show details for all of the requested show IDs using a
+    fixed number of queries. Returns a dictionary keyed by show ID"""
+
+    shows = OrderedDict()
+    show_ids = list(dict.fromkeys(show_ids))
+    if not show_ids:
+        return shows
+
     cursor = database_connection.cursor(dictionary=True)
     query = ("SELECT s.showid, s.showdate, s.bestof, s.repeatshowid, l.venue, "
              "l.city, l.state, h.host, sk.scorekeeper "
@@ -65,31 +157,72 @@ def retrieve_details(show_id: int,
              "JOIN ww_hosts h on h.hostid = hm.hostid "
              "JOIN ww_showskmap skm ON skm.showid = s.showid "
              "JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid "
-             "WHERE s.showid = %s;")
-    cursor.execute(query, (show_id, ))
-    result = cursor.fetchone()
+             "WHERE s.showid IN ({}) "
+             "ORDER BY s.showdate ASC;".format(", ".join(["%s"] * len(show_ids))))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
     cursor.close()
 
     if not result:
+        return shows
+
+    show_panelists = details.retrieve_panelists_by_show_ids(show_ids,
+                                                            database_connection)
+    show_guests = details.retrieve_guests_by_show_ids(show_ids,
+                                                      database_connection)
+
+    for row in result:
+        show = OrderedDict()
+        show["id"] = row["showid"]
+        show["date"] = row["showdate"].isoformat()
+        show["best_of"] = bool(row["bestof"])
+        show["repeat"] = bool(row["repeatshowid"])
+        show["location"] = OrderedDict()
+        show["location"]["venue"] = row["venue"]
+        show["location"]["city"] = row["city"]
+        show["location"]["state"] = row["state"]
+        show["host"] = row["host"]
+        show["scorekeeper"] = row["scorekeeper"]
+        show["panelists"] = show_panelists.get(show["id"])
+        show["guests"] = show_guests.get(show["id"])
+        shows[show["id"]] = show
+
+    return shows
+
+def retrieve_panelist_show_index(database_connection: mysql.connector.connect
+                                ) -> "PanelistShowIndex":
+    """Return the panelist show index for the current snapshot,
+    re-using the cached index until the data changes"""
+
+    show_snapshot = snapshot.get_snapshot(database_connection)
+    index = _index_cache.get("index", show_snapshot.version)
+    if index is None or index.snapshot is not show_snapshot:
+        index = _index_cache.set("index", show_snapshot.version,
+                                 PanelistShowIndex(show_snapshot))
+
+    return index
+
+def retrieve_matching_shows(database_connection: mysql.connector.connect,
+                            panelist_slugs: Iterable[str],
+                            exclude_panelist_slugs: Optional[Iterable[str]] = None,
+                            include_best_of: Optional[bool] = False,
+                            include_repeats: Optional[bool] = False
+                           ) -> List[Dict]:
+    """Retrieve show details for shows with a panel containing all of
+    the requested panelists and none of the excluded panelists. Best Of
+    and Repeat shows are only included if requested; shows that are
+    both are included if either is requested"""
+
+    index = retrieve_panelist_show_index(database_connection)
+    show_ids = index.search(panelist_slugs,
+                            exclude_panelist_slugs=exclude_panelist_slugs,
+                            include_best_of=include_best_of,
+                            include_repeats=include_repeats)
+    if not show_ids:
         return None
 
-    show = OrderedDict()
-    show["id"] = result["showid"]
-    show["date"] = result["showdate"].isoformat()
-    show["best_of"] = bool(result["bestof"])
-    show["repeat"] = bool(result["repeatshowid"])
-    show["location"] = OrderedDict()
-    show["location"]["venue"] = result["venue"]
-    show["location"]["city"] = result["city"]
-    show["location"]["state"] = result["state"]
-    show["host"] = result["host"]
-    show["scorekeeper"] = result["scorekeeper"]
-    show["panelists"] = details.retrieve_show_panelists(show_id=show["id"],
-                                                        database_connection=database_connection)
-    show["guests"] = details.retrieve_show_guests(show_id=show["id"],
-                                                  database_connection=database_connection)
-
-    return show
+    shows = retrieve_details_by_show_ids(show_ids, database_connection)
+    return [shows[show_id] for show_id in show_ids if show_id in shows] or None
 
 def retrieve_matching_one(database_connection: mysql.connector.connect,
                           panelist_slug_1: str,
@@ -99,36 +232,10 @@ def retrieve_matching_one(database_connection: mysql.connector.connect,
     """Retrieve show details for shows with a panel containing one of
     the requested panelists"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.bestof, s.repeatshowid "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE p.panelistslug = %s "
-             "GROUP BY s.showid "
-             "HAVING COUNT(s.showid) = 1 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_slug_1, ))
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    shows = []
-    for row in result:
-        best_of = bool(row["bestof"])
-        repeat = bool(row["repeatshowid"])
-
-        if (best_of and repeat) and (include_best_of or include_repeats):
-            shows.append(retrieve_details(row["showid"], database_connection))
-
-        if (best_of and not include_best_of) or (repeat and not include_repeats):
-            continue
-
-        shows.append(retrieve_details(row["showid"], database_connection))
-
-    return shows
+    return retrieve_matching_shows(database_connection,
+                                   [panelist_slug_1],
+                                   include_best_of=include_best_of,
+                                   include_repeats=include_repeats)
 
 def retrieve_matching_two(database_connection: mysql.connector.connect,
                           panelist_slug_1: str,
@@ -139,37 +246,10 @@ def retrieve_matching_two(database_connection: mysql.connector.connect,
     """Retrieve show details for shows with a panel containing two of
     the requested panelists"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.bestof, s.repeatshowid "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE p.panelistslug IN (%s, %s) "
-             "GROUP BY s.showid "
-             "HAVING COUNT(s.showid) = 2 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_slug_1,
-                           panelist_slug_2, ))
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    shows = []
-    for row in result:
-        best_of = bool(row["bestof"])
-        repeat = bool(row["repeatshowid"])
-
-        if (best_of and repeat) and (include_best_of or include_repeats):
-            shows.append(retrieve_details(row["showid"], database_connection))
-
-        if (best_of and not include_best_of) or (repeat and not include_repeats):
-            continue
-
-        shows.append(retrieve_details(row["showid"], database_connection))
-
-    return shows
+    return retrieve_matching_shows(database_connection,
+                                   [panelist_slug_1, panelist_slug_2],
+                                   include_best_of=include_best_of,
+                                   include_repeats=include_repeats)
 
 def retrieve_matching_three(database_connection: mysql.connector.connect,
                             panelist_slug_1: str,
@@ -181,39 +261,9 @@ def retrieve_matching_three(database_connection: mysql.connector.connect,
     """Retrieve show details for shows with a panel containing three of
     the requested panelists"""
 
-    cursor = database_connection.cursor(dictionary=True)
-    query = ("SELECT s.showid, s.bestof, s.repeatshowid "
-             "FROM ww_showpnlmap pm "
-             "JOIN ww_shows s ON s.showid = pm.showid "
-             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
-             "WHERE p.panelistslug IN (%s, %s, %s) "
-             "GROUP BY s.showid "
-             "HAVING COUNT(s.showid) = 3 "
-             "ORDER BY s.showdate ASC;")
-    cursor.execute(query, (panelist_slug_1,
-                           panelist_slug_2,
-                           panelist_slug_3, ))
-    result = cursor.fetchall()
-    cursor.close()
-
-    if not result:
-        return None
-
-    shows = []
-    for row in result:
-        best_of = bool(row["bestof"])
-        repeat = bool(row["repeatshowid"])
-
-        if (best_of and repeat) and (include_best_of or include_repeats):
-            shows.append(retrieve_details(row["showid"], database_connection))
-
-        if (best_of and not include_best_of) or (repeat and not include_repeats):
-            continue
-
-        shows.append(retrieve_details(row["showid"], database_connection))
-
-    return shows
-
-
+    return retrieve_matching_shows(database_connection,
+                                   [panelist_slug_1, panelist_slug_2, panelist_slug_3],
+                                   include_best_of=include_best_of,
+                                   include_repeats=include_repeats)
 
 #endregion
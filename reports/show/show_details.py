@@ -63,6 +63,171 @@ def retrieve_show_panelists(show_id: int,
 
     return panelists
 
+def retrieve_guests_by_show_ids(show_ids: List[int],
+                                database_connection: mysql.connector.connect
+                               ) -> Dict[int, List[Dict]]:
+    """Retrieve the Not My Job guests for all of the requested show IDs
+    using a single query. Returns a dictionary keyed by show ID"""
+
+    show_guests = {}
+    show_ids = list(dict.fromkeys(show_ids))
+    if not show_ids:
+        return show_guests
+
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT gm.showid, g.guestid, g.guest, g.guestslug "
+             "FROM ww_showguestmap gm "
+             "JOIN ww_guests g on g.guestid = gm.guestid "
+             "WHERE gm.showid IN ({});".format(", ".join(["%s"] * len(show_ids))))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
+    cursor.close()
+
+    for row in result:
+        guest = OrderedDict()
+        guest["id"] = row["guestid"]
+        guest["name"] = row["guest"]
+        guest["slug"] = row["guestslug"]
+        show_guests.setdefault(row["showid"], []).append(guest)
+
+    return show_guests
+
+def retrieve_panelists_by_show_ids(show_ids: List[int],
+                                   database_connection: mysql.connector.connect
+                                  ) -> Dict[int, List[Dict]]:
+    """Retrieve panelists for all of the requested show IDs using a
+    single query. Returns a dictionary keyed by show ID"""
+
+    show_panelists = {}
+    show_ids = list(dict.fromkeys(show_ids))
+    if not show_ids:
+        return show_panelists
+
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT pm.showid, p.panelistid, p.panelist, p.panelistslug "
+             "FROM ww_showpnlmap pm "
+             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
+             "WHERE pm.showid IN ({}) "
+             "ORDER BY pm.showpnlmapid ASC;".format(", ".join(["%s"] * len(show_ids))))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
+    cursor.close()
+
+    for row in result:
+        panelist = OrderedDict()
+        panelist["id"] = row["panelistid"]
+        panelist["name"] = row["panelist"]
+        panelist["slug"] = row["panelistslug"]
+        show_panelists.setdefault(row["showid"], []).append(panelist)
+
+    return show_panelists
+
+def retrieve_show_details_by_show_ids(show_ids: List[int],
+                                     database_connection: mysql.connector.connect
+                                    ) -> Dict[int, Dict]:
+    """Retrieves host, scorekeeper, panelist, guest and location
+    information for all of the requested show IDs using a fixed number
+    of queries. Returns an OrderedDict keyed by show ID, in the same
+    order as the requested show IDs; shows without host, scorekeeper
+    and guest information are not included"""
+
+    show_ids = list(dict.fromkeys(show_ids))
+    if not show_ids:
+        return OrderedDict()
+
+    placeholders = ", ".join(["%s"] * len(show_ids))
+    details = {}
+
+    # Retrieve host, scorekeeper and guest
+    cursor = database_connection.cursor(dictionary=True)
+    query = ("SELECT hm.showid, s.showdate, h.host, sk.scorekeeper, g.guest, "
+             "gm.guestscore, gm.exception "
+             "FROM ww_showhostmap hm "
+             "JOIN ww_shows s ON s.showid = hm.showid "
+             "JOIN ww_hosts h ON h.hostid = hm.hostid "
+             "JOIN ww_showskmap skm ON skm.showid = hm.showid "
+             "JOIN ww_scorekeepers sk ON sk.scorekeeperid = skm.scorekeeperid "
+             "JOIN ww_showguestmap gm ON gm.showid = hm.showid "
+             "JOIN ww_guests g ON g.guestid = gm.guestid "
+             "WHERE hm.showid IN ({});".format(placeholders))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
+
+    for row in result:
+        if row["showid"] in details:
+            continue
+
+        show_details = OrderedDict()
+        show_details["date"] = row["showdate"].isoformat()
+        show_details["host"] = row["host"]
+        show_details["scorekeeper"] = row["scorekeeper"]
+        guest = OrderedDict()
+        guest["name"] = row["guest"]
+        guest["score"] = row["guestscore"]
+        guest["exception"] = bool(row["exception"])
+        show_details["guest"] = guest
+        show_details["location"] = None
+        show_details["panelists"] = None
+        details[row["showid"]] = show_details
+
+    if not details:
+        cursor.close()
+        return OrderedDict()
+
+    # Retrieve show location details
+    query = ("SELECT lm.showid, l.city, l.state, l.venue "
+             "FROM ww_showlocationmap lm "
+             "JOIN ww_locations l ON l.locationid = lm.locationid "
+             "WHERE lm.showid IN ({});".format(placeholders))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
+
+    for row in result:
+        show_details = details.get(row["showid"])
+        if show_details is None or show_details["location"]:
+            continue
+
+        location = OrderedDict()
+        location["city"] = row["city"]
+        location["state"] = row["state"]
+        location["venue"] = row["venue"]
+        show_details["location"] = location
+
+    # Retrieve panelists and their respective show rank and score
+    query = ("SELECT pm.showid, p.panelist, pm.panelistscore "
+             "FROM ww_showpnlmap pm "
+             "JOIN ww_panelists p ON p.panelistid = pm.panelistid "
+             "WHERE pm.showid IN ({}) "
+             "ORDER BY pm.showid ASC, pm.panelistscore DESC, "
+             "pm.showpnlrank ASC;".format(placeholders))
+    cursor.execute(query, tuple(show_ids))
+    result = cursor.fetchall()
+    cursor.close()
+
+    for row in result:
+        show_details = details.get(row["showid"])
+        if show_details is None:
+            continue
+
+        panelist = OrderedDict()
+        panelist["name"] = row["panelist"]
+        panelist["score"] = row["panelistscore"]
+        if show_details["panelists"] is None:
+            show_details["panelists"] = []
+        show_details["panelists"].append(panelist)
+
+    return OrderedDict((show_id, details[show_id])
+                       for show_id in show_ids if show_id in details)
+
+def retrieve_show_details(show_id: int,
+                          database_connection: mysql.connector.connect
+                         ) -> Dict:
+    """Retrieves host, scorekeeper, panelist, guest and location
+    information for the requested show ID"""
+
+    details = retrieve_show_details_by_show_ids([show_id], database_connection)
+    return details.get(show_id)
+
 def retrieve_all_shows(database_connection: mysql.connector.connect
                       ) -> List[Dict]:
     """Retrieve a list of all shows and basic information including:
@@ -88,6 +253,10 @@ def retrieve_all_shows(database_connection: mysql.connector.connect
     if not result:
         return None
 
+    show_ids = [row["showid"] for row in result]
+    show_guests = retrieve_guests_by_show_ids(show_ids, database_connection)
+    show_panelists = retrieve_panelists_by_show_ids(show_ids, database_connection)
+
     show_count = 1
     for row in result:
         show = OrderedDict()
@@ -102,10 +271,8 @@ def retrieve_all_shows(database_connection: mysql.connector.connect
         show["location"]["state"] = row["state"]
         show["host"] = row["host"]
         show["scorekeeper"] = row["scorekeeper"]
-        show["guests"] = retrieve_show_guests(show_id=show["id"],
-                                              database_connection=database_connection)
-        show["panelists"] = retrieve_show_panelists(show_id=show["id"],
-                                                    database_connection=database_connection)
+        show["guests"] = show_guests.get(show["id"])
+        show["panelists"] = show_panelists.get(show["id"])
         shows.append(show)
         show_count += 1
 
@@ -137,6 +304,10 @@ def retrieve_all_original_shows(database_connection: mysql.connector.connect
     if not result:
         return None
 
+    show_ids = [row["showid"] for row in result]
+    show_guests = retrieve_guests_by_show_ids(show_ids, database_connection)
+    show_panelists = retrieve_panelists_by_show_ids(show_ids, database_connection)
+
     show_count = 1
     for row in result:
         show = OrderedDict()
@@ -149,10 +320,8 @@ def retrieve_all_original_shows(database_connection: mysql.connector.connect
         show["location"]["state"] = row["state"]
         show["host"] = row["host"]
         show["scorekeeper"] = row["scorekeeper"]
-        show["panelists"] = retrieve_show_panelists(show_id=show["id"],
-                                                    database_connection=database_connection)
-        guest = retrieve_show_guests(show_id=show["id"],
-                                     database_connection=database_connection)
+        show["panelists"] = show_panelists.get(show["id"])
+        guest = show_guests.get(show["id"])
         if guest:
             show["guest"] = guest[0]
 
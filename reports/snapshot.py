@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018-2022 Linh Pham
+# reports.wwdt.me is released under the terms of the Apache License 2.0
+"""In-memory columnar snapshot of the show and panelist tables shared
+by the report modules"""
+
+from datetime import date
+import threading
+from typing import List, Optional, Tuple
+import mysql.connector
+import numpy
+
+from reports import data_version
+
+RANKS = ("1", "1t", "2", "2t", "3")
+RANK_CODES = {rank: code for code, rank in enumerate(RANKS)}
+NO_RANK = -1
+
+#region Snapshot Class
+class ShowSnapshot:
+    """Column arrays for every panelist appearance (one row per
+    ww_showpnlmap entry, ordered by show date) along with show and
+    panelist dimension arrays and lookups.
+
+    Appearance columns: show_id, show_date, best_of, repeat, panelist_id,
+    score, rank, lightning_start, lightning_correct and gender. Missing
+    scores and Lightning round values are stored as NaN and missing
+    ranks as NO_RANK. show_pos and panelist_pos hold each row's index
+    into the show and panelist dimension arrays."""
+
+    def __init__(self, version: Optional[str] = None):
+        self.version = version
+
+        # Show dimension
+        self.shows_id = numpy.empty(0, dtype=numpy.int64)
+        self.shows_date = numpy.empty(0, dtype="datetime64[D]")
+        self.shows_best_of = numpy.empty(0, dtype=bool)
+        self.shows_repeat = numpy.empty(0, dtype=bool)
+        self.show_index = {}
+
+        # Panelist dimension
+        self.panelists_id = numpy.empty(0, dtype=numpy.int64)
+        self.panelists_name = []
+        self.panelists_slug = []
+        self.panelists_gender = numpy.empty(0, dtype="<U1")
+        self.panelist_index = {}
+        self.panelist_slug_index = {}
+
+        # Panelist appearance columns
+        self.show_pos = numpy.empty(0, dtype=numpy.int64)
+        self.panelist_pos = numpy.empty(0, dtype=numpy.int64)
+        self.show_id = numpy.empty(0, dtype=numpy.int64)
+        self.show_date = numpy.empty(0, dtype="datetime64[D]")
+        self.best_of = numpy.empty(0, dtype=bool)
+        self.repeat = numpy.empty(0, dtype=bool)
+        self.panelist_id = numpy.empty(0, dtype=numpy.int64)
+        self.score = numpy.empty(0, dtype=numpy.float64)
+        self.rank = numpy.empty(0, dtype=numpy.int8)
+        self.lightning_start = numpy.empty(0, dtype=numpy.float64)
+        self.lightning_correct = numpy.empty(0, dtype=numpy.float64)
+        self.gender = numpy.empty(0, dtype="<U1")
+
+    def __len__(self) -> int:
+        return len(self.show_id)
+
+    @property
+    def regular(self) -> numpy.ndarray:
+        """Mask of appearances on non-Best Of and non-Repeat shows"""
+        return ~self.best_of & ~self.repeat
+
+    @property
+    def has_score(self) -> numpy.ndarray:
+        """Mask of appearances with a panelist score"""
+        return ~numpy.isnan(self.score)
+
+    @property
+    def shows_year(self) -> numpy.ndarray:
+        """Show year for each show"""
+        return self.shows_date.astype("datetime64[Y]").astype(numpy.int64) + 1970
+
+    @property
+    def year(self) -> numpy.ndarray:
+        """Show year for each appearance"""
+        return self.show_date.astype("datetime64[Y]").astype(numpy.int64) + 1970
+
+    def aired(self, as_of: Optional[date] = None) -> numpy.ndarray:
+        """Mask of appearances on shows that aired on or before the
+        requested date, which defaults to today"""
+        as_of = numpy.datetime64(as_of or date.today(), "D")
+        return self.show_date <= as_of
+
+    def panelists_by_slug(self) -> List[Tuple[str, int]]:
+        """Return (slug, panelist index) pairs for every panelist other
+        than the <Multiple> placeholder, ordered by slug"""
+        return sorted((slug, index)
+                      for index, (slug, name) in enumerate(zip(self.panelists_slug,
+                                                               self.panelists_name))
+                      if name != "<Multiple>")
+
+    def scores(self, mask: numpy.ndarray) -> List[int]:
+        """Return the scores selected by the mask as a list of ints"""
+        return self.score[mask].astype(numpy.int64).tolist()
+
+#endregion
+
+#region Loading Functions
+def _nullable(values: List, dtype=numpy.float64) -> numpy.ndarray:
+    """Convert a list with possible None values into a float array
+    with NaN in place of None"""
+    return numpy.array([numpy.nan if value is None else value for value in values],
+                       dtype=dtype)
+
+def load_snapshot(database_connection: mysql.connector.connect,
+                  version: Optional[str] = None) -> ShowSnapshot:
+    """Load shows, panelists and panelist appearances from the database
+    into a new ShowSnapshot"""
+
+    snapshot = ShowSnapshot(version=version)
+
+    cursor = database_connection.cursor()
+    query = ("SELECT s.showid, s.showdate, s.bestof, s.repeatshowid "
+             "FROM ww_shows s "
+             "ORDER BY s.showdate ASC;")
+    cursor.execute(query)
+    shows = cursor.fetchall()
+
+    query = ("SELECT p.panelistid, p.panelist, p.panelistslug, "
+             "p.panelistgender "
+             "FROM ww_panelists p "
+             "ORDER BY p.panelistid ASC;")
+    cursor.execute(query)
+    panelists = cursor.fetchall()
+
+    query = ("SELECT pm.showid, pm.panelistid, pm.panelistscore, "
+             "pm.showpnlrank, pm.panelistlrndstart, pm.panelistlrndcorrect "
+             "FROM ww_showpnlmap pm "
+             "JOIN ww_shows s ON s.showid = pm.showid "
+             "ORDER BY s.showdate ASC, pm.showpnlmapid ASC;")
+    cursor.execute(query)
+    appearances = cursor.fetchall()
+    cursor.close()
+
+    if shows:
+        columns = list(zip(*shows))
+        snapshot.shows_id = numpy.array(columns[0], dtype=numpy.int64)
+        snapshot.shows_date = numpy.array(columns[1], dtype="datetime64[D]")
+        snapshot.shows_best_of = numpy.array(columns[2], dtype=bool)
+        snapshot.shows_repeat = numpy.array([bool(value) for value in columns[3]],
+                                            dtype=bool)
+        snapshot.show_index = {show_id: index
+                               for index, show_id in enumerate(columns[0])}
+
+    if panelists:
+        columns = list(zip(*panelists))
+        snapshot.panelists_id = numpy.array(columns[0], dtype=numpy.int64)
+        snapshot.panelists_name = list(columns[1])
+        snapshot.panelists_slug = list(columns[2])
+        snapshot.panelists_gender = numpy.array([(gender or "")[:1].upper()
+                                                 for gender in columns[3]],
+                                                dtype="<U1")
+        snapshot.panelist_index = {panelist_id: index
+                                   for index, panelist_id in enumerate(columns[0])}
+        snapshot.panelist_slug_index = {slug: index
+                                        for index, slug in enumerate(columns[2])}
+
+    if appearances:
+        columns = list(zip(*appearances))
+        snapshot.show_pos = numpy.array([snapshot.show_index[show_id]
+                                         for show_id in columns[0]],
+                                        dtype=numpy.int64)
+        snapshot.panelist_pos = numpy.array([snapshot.panelist_index[panelist_id]
+                                             for panelist_id in columns[1]],
+                                            dtype=numpy.int64)
+        snapshot.show_id = snapshot.shows_id[snapshot.show_pos]
+        snapshot.show_date = snapshot.shows_date[snapshot.show_pos]
+        snapshot.best_of = snapshot.shows_best_of[snapshot.show_pos]
+        snapshot.repeat = snapshot.shows_repeat[snapshot.show_pos]
+        snapshot.panelist_id = snapshot.panelists_id[snapshot.panelist_pos]
+        snapshot.gender = snapshot.panelists_gender[snapshot.panelist_pos]
+        snapshot.score = _nullable(columns[2])
+        snapshot.rank = numpy.array([RANK_CODES.get(rank, NO_RANK)
+                                     for rank in columns[3]],
+                                    dtype=numpy.int8)
+        snapshot.lightning_start = _nullable(columns[4])
+        snapshot.lightning_correct = _nullable(columns[5])
+
+    return snapshot
+
+#endregion
+
+#region Snapshot Cache
+class SnapshotCache:
+    """Holds the current snapshot and reloads it when the data version
+    reported by the data version probe changes"""
+
+    def __init__(self, probe: data_version.DataVersionProbe = data_version.probe):
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def get(self, database_connection: mysql.connector.connect
+           ) -> ShowSnapshot:
+        """Return the current snapshot, loading a new one if the data
+        has changed since the snapshot was taken"""
+        version = self._probe.current(database_connection)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        # Only one thread loads a new snapshot; others wait and re-use it
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = load_snapshot(database_connection, version)
+
+            return self._snapshot
+
+    def clear(self) -> None:
+        """Drop the current snapshot"""
+        with self._lock:
+            self._snapshot = None
+
+#endregion
+
+cache = SnapshotCache()
+
+def get_snapshot(database_connection: mysql.connector.connect
+                ) -> ShowSnapshot:
+    """Return the shared snapshot, reloading it if the data changed"""
+    return cache.get(database_connection)
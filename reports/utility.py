@@ -3,10 +3,11 @@
 # reports.wwdt.me is released under the terms of the Apache License 2.0
 """Utility functions used by the Reports Site"""
 
-from functools import cmp_to_key
 from datetime import datetime
+from hashlib import sha1
 from operator import itemgetter as i
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
+import os
 from dateutil import parser
 import pytz
 
@@ -50,31 +51,68 @@ def time_zone_parser(time_zone: str) -> pytz.timezone:
 
 #endregion
 
-#region Sorting Functions
-def cmp(object_a, object_b):
-    """Replacement for built-in function cmp that was removed in Python 3
-
-    Compare the two objects a and b and return an integer according to
-    the outcome. The return value is negative if a < b, zero if a == b
-    and strictly positive if a > b.
+#region File Functions
+def directory_checksum(path: str) -> str:
+    """Return a checksum of the names and contents of all files under
+    the requested directory"""
+    checksum = sha1()
+    for root, directories, files in os.walk(path):
+        directories.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            checksum.update(os.path.relpath(file_path, path).encode("utf-8"))
+            with open(file_path, "rb") as file_object:
+                checksum.update(file_object.read())
+
+    return checksum.hexdigest()
 
-    https://portingguide.readthedocs.io/en/latest/comparisons.html#the-cmp-function
-    """
+#endregion
 
-    return (object_a > object_b) - (object_a < object_b)
+#region Sorting Functions
+def _parse_sort_columns(columns: List[str]) -> List[Tuple[List[str], bool]]:
+    """Parse sort column names, prefixed with '-' for descending order,
+    into runs of consecutive keys that share the same sort direction"""
+    runs = []
+    for column in columns:
+        descending = column.startswith("-")
+        key = column[1:].strip() if descending else column.strip()
+        if runs and runs[-1][1] == descending:
+            runs[-1][0].append(key)
+        else:
+            runs.append(([key], descending))
+
+    return runs
+
+def _none_last_key(keys: List[str], descending: bool) -> Callable:
+    """Build a sort key function for the keys that places None values
+    after all other values, in either sort direction"""
+    def key_function(item):
+        key_values = []
+        for key in keys:
+            value = item[key]
+            key_values.append((value is None) != descending)
+            key_values.append(value)
+
+        return tuple(key_values)
+
+    return key_function
 
 def multi_key_sort(items: List[Dict], columns: List) -> List[Dict]:
-    """Sorts a list of dictionaries based on a list of one or more keys"""
-    comparers = [
-        ((i(col[1:].strip()), -1) if col.startswith('-') else (i(col.strip()), 1))
-        for col in columns
-    ]
-    def comparer(left, right):
-        comparer_iter = (
-            cmp(fn(left), fn(right)) * mult
-            for fn, mult in comparers
-        )
-        return next((result for result in comparer_iter if result), 0)
-    return sorted(items, key=cmp_to_key(comparer))
+    """Sorts a list of dictionaries based on a list of one or more keys.
+    Keys prefixed with '-' are sorted in descending order and None
+    values are sorted last.
+
+    Runs of keys with the same direction are sorted together using
+    stable sorts, from the last run to the first"""
+    items = list(items)
+    for keys, descending in reversed(_parse_sort_columns(columns)):
+        if any(item[key] is None for item in items for key in keys):
+            key_function = _none_last_key(keys, descending)
+        else:
+            key_function = i(*keys)
+
+        items.sort(key=key_function, reverse=descending)
+
+    return items
 
 #endregion